@@ -1,91 +1,163 @@
 from __future__ import annotations
 
+import functools
 import os
+import re
 import shutil
 import sys
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+_AERENDER_ENV_VARS = ("AERENDER_PATH", "AE_AERENDER_PATH")
+_AERENDER_REL_WIN = os.path.join("Support Files", "aerender.exe")
 
-def _dedupe_existing(paths: Iterable[Path]) -> List[Path]:
+# Install folder names, equivalent to the globs "Adobe After Effects *" / "After Effects *".
+# Case-insensitive on Windows, like Path.glob there.
+_AE_DIR_RE = re.compile(r"(Adobe )?After Effects .*", re.IGNORECASE if sys.platform == "win32" else 0)
+
+# Placeholder values UIs pass for "no explicit path".
+_NONE_SENTINELS = frozenset(("NONE", "__NONE__", "NULL"))
+
+# shutil.which results, memoized per process (PATH scans are repeated per chunk otherwise).
+_which_cache: Dict[str, Optional[str]] = {}
+
+
+def _which(exe: str) -> Optional[str]:
+    if exe not in _which_cache:
+        _which_cache[exe] = shutil.which(exe)
+    return _which_cache[exe]
+
+
+def _dedupe_existing(paths: Iterable[Union[str, Path]]) -> List[Path]:
     seen = set()
     out: List[Path] = []
     for p in paths:
-        try:
-            rp = p.expanduser()
-        except Exception:
-            rp = p
-        rp = Path(str(rp))
-        if not rp:
+        s = os.fspath(p)
+        if s.startswith("~"):
+            s = os.path.expanduser(s)
+        if not s:
             continue
-        key = str(rp)
-        if sys.platform == "win32":
-            key = key.lower()
+        # normcase folds case (and slashes) on Windows only, matching the filesystem.
+        key = sys.intern(os.path.normcase(s))
         if key in seen:
             continue
-        if rp.exists():
+        if os.path.exists(s):
             seen.add(key)
-            out.append(rp)
+            out.append(Path(s))
     return out
 
 
+def _scan_install_dirs(root: str) -> List[str]:
+    """
+    Return child directories of root named "Adobe After Effects *" or "After Effects *".
+    One os.scandir pass (cached dirent types) + a precompiled regex instead of two Path.glob calls;
+    "Adobe "-prefixed folders are listed first, matching the previous glob order.
+    """
+    prefixed: List[str] = []
+    plain: List[str] = []
+    try:
+        with os.scandir(root) as it:
+            for e in it:
+                m = _AE_DIR_RE.match(e.name)
+                if not m:
+                    continue
+                try:
+                    if not e.is_dir():
+                        continue
+                except OSError:
+                    continue
+                (prefixed if m.group(1) else plain).append(e.path)
+    except OSError:
+        pass
+    return prefixed + plain
+
+
 def discover_aerender_candidates(after_effects_dir: Optional[str] = None) -> List[Path]:
     """
     Return a list of plausible aerender paths in priority order.
     This does not log; it only discovers.
+
+    Results are cached per (install dir, platform, env overrides) for the life of the process.
+    """
+    return list(_discover_cached(*_discovery_key(after_effects_dir)))
+
+
+def _discovery_key(after_effects_dir: Optional[str]) -> Tuple[Optional[str], str, Tuple[str, ...]]:
+    env_paths = tuple(os.environ.get(k) or "" for k in _AERENDER_ENV_VARS)
+    return (str(after_effects_dir) if after_effects_dir else None), sys.platform, env_paths
+
+
+@functools.lru_cache(maxsize=8)
+def _discover_cached(after_effects_dir: Optional[str], platform: str, env_paths: Tuple[str, ...]) -> Tuple[Path, ...]:
+    return tuple(_dedupe_existing(_iter_candidates(after_effects_dir, platform, env_paths)))
+
+
+@functools.lru_cache(maxsize=8)
+def _first_aerender_cached(after_effects_dir: Optional[str], platform: str, env_paths: Tuple[str, ...]) -> Optional[str]:
+    """
+    First existing aerender file for a discovery key, memoized like _discover_cached.
+    Candidates are walked lazily and the walk stops at the first hit, so the install-folder
+    scans only run when the env vars / PATH don't already resolve.
     """
-    candidates: List[Path] = []
+    seen = set()
+    for c in _iter_candidates(after_effects_dir, platform, env_paths):
+        c = os.path.expanduser(c)
+        key = os.path.normcase(c)
+        if key in seen:
+            continue
+        seen.add(key)
+        if os.path.isfile(c):
+            return c
+    return None
+
 
+def _iter_candidates(after_effects_dir: Optional[str], platform: str, env_paths: Tuple[str, ...]) -> Iterator[str]:
+    """
+    Lazily yield raw candidate paths (not deduped, not checked) in priority order.
+    Candidates stay plain strings (os.path joins); later sources are only probed if consumed.
+    """
     # 1) Explicit env vars
-    for k in ("AERENDER_PATH", "AE_AERENDER_PATH"):
-        v = os.environ.get(k)
+    for v in env_paths:
         if v:
-            candidates.append(Path(v))
+            yield v
 
     # 2) PATH
     for exe in ("aerender", "aerender.exe"):
-        w = shutil.which(exe)
+        w = _which(exe)
         if w:
-            candidates.append(Path(w))
+            yield w
 
     # 3) User-specified install root
     if after_effects_dir:
-        base = Path(after_effects_dir).expanduser()
+        base = os.path.expanduser(after_effects_dir)
         # Windows install layout
-        candidates.append(base / "Support Files" / "aerender.exe")
-        candidates.append(base / "Support Files" / "aerender")
+        yield os.path.join(base, _AERENDER_REL_WIN)
+        yield os.path.join(base, "Support Files", "aerender")
         # macOS folder layout (aerender at top level)
-        candidates.append(base / "aerender")
+        yield os.path.join(base, "aerender")
 
     # 4) OS defaults
-    if sys.platform == "win32":
+    if platform == "win32":
         roots = []
         for env in ("ProgramW6432", "ProgramFiles", "ProgramFiles(x86)"):
             v = os.environ.get(env)
             if v:
-                roots.append(Path(v))
+                roots.append(v)
         if not roots:
-            roots = [Path(r"C:\Program Files"), Path(r"C:\Program Files (x86)")]
+            roots = [r"C:\Program Files", r"C:\Program Files (x86)"]
 
         # Typical: C:\Program Files\Adobe\Adobe After Effects 2024\Support Files\aerender.exe
+        # Some installs don't include "Adobe " prefix
         for r in roots:
-            adobe = r / "Adobe"
-            if not adobe.exists():
-                continue
-            candidates.extend(adobe.glob("Adobe After Effects */Support Files/aerender.exe"))
-            # Some installs don't include "Adobe " prefix
-            candidates.extend(adobe.glob("After Effects */Support Files/aerender.exe"))
-
-    elif sys.platform == "darwin":
-        apps = Path("/Applications")
-        if apps.exists():
-            # Typical: /Applications/Adobe After Effects 2024/aerender
-            candidates.extend(apps.glob("Adobe After Effects */aerender"))
-            # Beta / other naming
-            candidates.extend(apps.glob("After Effects */aerender"))
+            for d in _scan_install_dirs(os.path.join(r, "Adobe")):
+                yield os.path.join(d, _AERENDER_REL_WIN)
+
+    elif platform == "darwin":
+        # Typical: /Applications/Adobe After Effects 2024/aerender (plus beta / other naming)
+        for d in _scan_install_dirs("/Applications"):
+            yield os.path.join(d, "aerender")
 
     # Linux is not supported by AE; we still allow AERENDER_PATH or PATH.
-    return _dedupe_existing(candidates)
 
 
 def resolve_aerender_path(
@@ -96,17 +168,17 @@ def resolve_aerender_path(
     """
     Resolve aerender path from CLI/env/auto-discovery. Raises SystemExit on failure.
     """
-    if aerender_path and str(aerender_path).strip() and str(aerender_path).strip().upper() not in ("NONE", "__NONE__", "NULL"):
-        p = Path(os.path.expandvars(os.path.expanduser(str(aerender_path).strip())))
-        if p.exists():
-            logger.info(f"Using aerender executable: {p}")
-            return str(p)
-
-    cands = discover_aerender_candidates(after_effects_dir=after_effects_dir)
-    for c in cands:
-        if c.exists():
-            logger.info(f"Auto-located aerender: {c}")
-            return str(c)
+    cleaned = str(aerender_path or "").strip()
+    if cleaned and cleaned.upper() not in _NONE_SENTINELS:
+        expanded = os.path.expandvars(os.path.expanduser(cleaned))
+        if os.path.isfile(expanded):
+            logger.info(f"Using aerender executable: {expanded}")
+            return expanded
+
+    found = _first_aerender_cached(*_discovery_key(after_effects_dir))
+    if found:
+        logger.info(f"Auto-located aerender: {found}")
+        return found
 
     msg = (
         "Could not locate the After Effects aerender executable.\n"
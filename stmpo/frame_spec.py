@@ -1,16 +1,51 @@
 from __future__ import annotations
 
+import re
+import sys
 from dataclasses import dataclass
+from itertools import chain, islice
 from typing import List, Optional, Tuple
 
+# One comma-separated part: "N" or "A-B" (whitespace allowed), or empty.
+_PART_RE = re.compile(r"\s*(?:(\d+)\s*(?:-\s*(\d+))?)?\s*(?:,|\Z)")
 
-@dataclass(frozen=True)
+
+# dataclass(slots=True) drops the per-instance __dict__ and generates
+# frozen-safe __getstate__/__setstate__ (3.11+; 3.10 slots break pickling of
+# frozen classes), older Pythons get a plain dataclass.
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 11) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class Chunk:
     index: int
     start_frame: int
     end_frame: int
 
 
+def parse_frames_ranges(frames_spec: str) -> List[Tuple[int, int]]:
+    """
+    Parse a framespec like "0-99,120-200" into sorted, merged (start, end) ranges.
+    Same frames as parse_frames, but O(parts) memory instead of one int per frame.
+    """
+    spec = str(frames_spec)
+    ranges: List[Tuple[int, int]] = []
+    pos, n = 0, len(spec)
+    while pos < n:
+        m = _PART_RE.match(spec, pos)
+        if m is None:
+            raise ValueError(f"Invalid framespec {spec!r} near position {pos}")
+        pos = m.end()
+        if m.group(1) is None:
+            continue  # empty part, e.g. "1-5,,8"
+        start = int(m.group(1))
+        end = int(m.group(2)) if m.group(2) is not None else start
+        if end < start:
+            start, end = end, start
+        ranges.append((start, end))
+    return _merge_ranges(ranges)
+
+
 def parse_frames(frames_spec: str) -> List[int]:
     """
     Parse a simple framespec like:
@@ -19,63 +54,86 @@ def parse_frames(frames_spec: str) -> List[int]:
 
     This intentionally stays conservative (debug harness).
     """
-    frames: List[int] = []
-    for part in str(frames_spec).split(","):
-        part = part.strip()
-        if not part:
-            continue
-        if "-" in part:
-            a, b = part.split("-", 1)
-            start = int(a)
-            end = int(b)
-            if end < start:
-                start, end = end, start
-            frames.extend(range(start, end + 1))
-        else:
-            frames.append(int(part))
-    return sorted(set(frames))
+    return list(chain.from_iterable(range(s, e + 1) for s, e in parse_frames_ranges(frames_spec)))
 
 
-def build_chunks(frames: List[int], chunk_size: int) -> List[Chunk]:
-    chunks: List[Chunk] = []
-    if not frames:
-        return chunks
-    if chunk_size <= 0:
-        chunk_size = len(frames)
-
-    start = frames[0]
-    prev = start
-    count = 1
-    chunk_start = start
-    chunk_index = 0
-
-    for f in frames[1:]:
-        if f != prev + 1 or count >= chunk_size:
-            chunks.append(Chunk(chunk_index, chunk_start, prev))
-            chunk_index += 1
-            chunk_start = f
-            count = 1
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Sort (start, end) ranges and merge overlapping/adjacent ones.
+    Works on the handful of parsed parts, never on individual frames.
+    """
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
         else:
-            count += 1
+            merged.append((start, end))
+    return merged
+
+
+def _contiguous_runs(frames: List[int]) -> List[Tuple[int, int]]:
+    """Split frames into maximal (start, end) runs of consecutive ints."""
+    runs: List[Tuple[int, int]] = []
+    start = prev = frames[0]
+    for f in islice(frames, 1, None):
+        if f != prev + 1:
+            runs.append((start, prev))
+            start = f
         prev = f
+    runs.append((start, prev))
+    return runs
+
+
+def _chunk_count(run_start: int, run_end: int, size: int) -> int:
+    return (run_end - run_start) // size + 1
+
 
-    chunks.append(Chunk(chunk_index, chunk_start, prev))
+def build_chunks_from_ranges(ranges: List[Tuple[int, int]], chunk_size: int) -> List[Chunk]:
+    """
+    Build chunks from maximal contiguous (start, end) runs, e.g. parse_frames_ranges output.
+    chunk_size <= 0 means one chunk per run.
+    """
+    chunks: List[Chunk] = []
+    # Chunk boundaries only depend on run endpoints: split each run by arithmetic.
+    for run_start, run_end in ranges:
+        size = chunk_size if chunk_size > 0 else run_end - run_start + 1
+        last = size - 1
+        # range() steps the chunk starts in C; no per-chunk multiply in the loop body.
+        for start in range(run_start, run_end + 1, size):
+            chunks.append(Chunk(len(chunks), start, min(start + last, run_end)))
     return chunks
 
 
-def select_task_range(frames_spec: str, chunk_size: Optional[int], index: Optional[int]) -> Tuple[int, int]:
-    frames = parse_frames(frames_spec)
+def build_chunks(frames: List[int], chunk_size: int) -> List[Chunk]:
     if not frames:
+        return []
+    return build_chunks_from_ranges(_contiguous_runs(frames), chunk_size)
+
+
+def select_task_range(frames_spec: str, chunk_size: Optional[int], index: Optional[int]) -> Tuple[int, int]:
+    ranges = parse_frames_ranges(frames_spec)
+    if not ranges:
         raise ValueError(f"No frames parsed from spec: {frames_spec}")
 
     if chunk_size and index is not None:
-        chunks = build_chunks(frames, int(chunk_size))
-        match = next((c for c in chunks if c.index == int(index)), None)
-        if not match:
-            raise ValueError(
-                f"Index {index} not found in chunks. frames={frames_spec}, chunk_size={chunk_size}, "
-                f"chunk_count={len(chunks)}"
-            )
-        return match.start_frame, match.end_frame
-
-    return frames[0], frames[-1]
+        # Locate the chunk arithmetically instead of building every chunk; for the common
+        # single-range spec ("0-999") this is O(1). Same numbering as build_chunks_from_ranges.
+        cs = int(chunk_size)
+        idx = int(index)
+        remaining = idx
+        if idx >= 0:
+            for run_start, run_end in ranges:
+                size = cs if cs > 0 else run_end - run_start + 1
+                n = _chunk_count(run_start, run_end, size)
+                if remaining < n:
+                    start = run_start + remaining * size
+                    return start, min(start + size - 1, run_end)
+                remaining -= n
+        chunk_count = sum(_chunk_count(s, e, cs if cs > 0 else e - s + 1) for s, e in ranges)
+        raise ValueError(
+            f"Index {index} not found in chunks. frames={frames_spec}, chunk_size={chunk_size}, "
+            f"chunk_count={chunk_count}"
+        )
+
+    return ranges[0][0], ranges[-1][1]
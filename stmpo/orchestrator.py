@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import functools
+import heapq
 import json
+import locale
 import logging
 import os
 import queue
+import selectors
+import shlex
 import shutil
 import signal
 import subprocess
@@ -14,6 +20,7 @@ import threading
 import time
 import uuid
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -23,6 +30,11 @@ try:
 except Exception:  # pragma: no cover
     psutil = None  # type: ignore
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 
 # -----------------------------
 # Types
@@ -34,60 +46,77 @@ class ChildProc:
     frame_range: Tuple[int, int]
     affinity: Optional[List[int]]
     psutil_proc: Optional[object]  # psutil.Process when available
-    start_time: float
+    start_ns: int  # time.monotonic_ns() at launch
 
 
 # -----------------------------
 # Helpers: output patterns
 # -----------------------------
 
+_RX_AE = re.compile(r"\[[#0]+\]")     # AE: [#####] or [00000]
+_RX_HASH = re.compile(r"#{3,}")         # #### style
+_RX_PRINTF = re.compile(r"%0?\d*d")     # printf style, e.g. %04d
+
+
 def looks_like_sequence(path_str: str) -> bool:
     """Heuristic: True if output path looks like an image-sequence pattern."""
     return (
-        re.search(r"\[[#0]+\]", path_str) is not None  # AE: [#####] or [00000]
-        or re.search(r"#{3,}", path_str) is not None   # #### style
-        or re.search(r"%0?\d*d", path_str) is not None # printf style, e.g. %04d
+        _RX_AE.search(path_str) is not None
+        or _RX_HASH.search(path_str) is not None
+        or _RX_PRINTF.search(path_str) is not None
     )
 
 
-def build_output_matcher(output_spec: str):
-    """
-    Builds a predicate Path->bool that returns True only for files that are render outputs.
-
-    Supports:
-      - AE style: prefix_[#####].png or prefix_[00000].png
-      - hash: prefix_####.png
-      - printf: prefix_%04d.png
-      - single file: exact filename match
-    """
-    base = Path(output_spec).name
-
+@functools.lru_cache(maxsize=8)
+def _compile_output_matcher(base: str) -> Tuple[str, object]:
+    """Compile the filename test for an output basename once; returns ("rx", pattern) or ("name", lowered)."""
     # AE: prefix_[#####]suffix
     m = re.match(r"(.*)\[([#0]+)\](.*)", base)
     if m:
         prefix, token, suffix = m.group(1), m.group(2), m.group(3)
         digits = len(token)
-        rx = re.compile(rf"^{re.escape(prefix)}\d{{{digits}}}{re.escape(suffix)}$", re.IGNORECASE)
-        return lambda p: bool(rx.match(p.name))
+        return "rx", re.compile(rf"^{re.escape(prefix)}\d{{{digits}}}{re.escape(suffix)}$", re.IGNORECASE)
 
     # Hash: prefix####suffix
     m = re.match(r"(.*?)(#{3,})(\.[^.]*)?$", base)
     if m:
         prefix, hashes, ext = m.group(1), m.group(2), m.group(3) or ""
         digits = len(hashes)
-        rx = re.compile(rf"^{re.escape(prefix)}\d{{{digits}}}{re.escape(ext)}$", re.IGNORECASE)
-        return lambda p: bool(rx.match(p.name))
+        return "rx", re.compile(rf"^{re.escape(prefix)}\d{{{digits}}}{re.escape(ext)}$", re.IGNORECASE)
 
     # printf: prefix%04dsuffix
     m = re.match(r"(.*)%0?(\d*)d(.*)", base)
     if m:
         prefix, digits_s, suffix = m.group(1), m.group(2), m.group(3)
         digits = int(digits_s) if digits_s else 1
-        rx = re.compile(rf"^{re.escape(prefix)}\d{{{digits}}}{re.escape(suffix)}$", re.IGNORECASE)
-        return lambda p: bool(rx.match(p.name))
+        return "rx", re.compile(rf"^{re.escape(prefix)}\d{{{digits}}}{re.escape(suffix)}$", re.IGNORECASE)
 
     # Single file
-    return lambda p: p.name.lower() == base.lower()
+    return "name", base.lower()
+
+
+def _seq_match(pattern, name: str) -> bool:
+    return pattern.match(name) is not None
+
+
+def _name_match(lowered: str, name: str) -> bool:
+    return name.lower() == lowered
+
+
+def build_output_matcher(output_spec: str):
+    """
+    Builds a predicate (file name str)->bool that returns True only for files that are render outputs.
+
+    Supports:
+      - AE style: prefix_[#####].png or prefix_[00000].png
+      - hash: prefix_####.png
+      - printf: prefix_%04d.png
+      - single file: exact filename match
+    """
+    kind, compiled = _compile_output_matcher(Path(output_spec).name)
+    if kind == "rx":
+        return functools.partial(_seq_match, compiled)
+    return functools.partial(_name_match, compiled)
 
 
 # -----------------------------
@@ -119,12 +148,16 @@ def setup_logging(log_file: Optional[str]) -> logging.Logger:
     return logger
 
 
+@functools.lru_cache(maxsize=1)
 def find_ffmpeg() -> Optional[str]:
     """Return an ffmpeg executable path if available, else None.
 
     Order:
       1) $FFMPEG environment var (explicit path)
       2) ffmpeg on PATH
+
+    The answer is cached for the life of the process (it's probed at setup and again
+    before stitching).
     """
     env = os.environ.get("FFMPEG")
     if env:
@@ -134,10 +167,45 @@ def find_ffmpeg() -> Optional[str]:
     return shutil.which("ffmpeg")
 
 
+# concat demuxer list syntax uses single quotes; a quote inside a path becomes '\''
+_FFCONCAT_TR = str.maketrans({"'": "'\\''"})
+
+
 def _ffconcat_escape_path(p: Path) -> str:
-    # concat demuxer list syntax uses single quotes; escape single quotes if present.
-    s = str(p)
-    return s.replace("'", "'\\''")
+    return str(p).translate(_FFCONCAT_TR)
+
+
+# Preferred hardware H.264 encoders (first match wins) and their roughly crf-18 settings.
+_HW_H264_ARGS: Dict[str, Tuple[str, ...]] = {
+    "h264_videotoolbox": ("-c:v", "h264_videotoolbox", "-q:v", "65", "-pix_fmt", "yuv420p"),
+    "h264_nvenc": ("-c:v", "h264_nvenc", "-preset", "p6", "-cq", "19", "-rc", "vbr", "-pix_fmt", "yuv420p"),
+    "h264_qsv": ("-c:v", "h264_qsv", "-global_quality", "19", "-pix_fmt", "nv12"),
+    "h264_amf": ("-c:v", "h264_amf", "-rc", "cqp", "-qp_i", "19", "-qp_p", "19", "-pix_fmt", "yuv420p"),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_hw_encoder(ffmpeg_path: str) -> Optional[str]:
+    """Return the first hardware H.264 encoder this ffmpeg build lists, else None (cached)."""
+    try:
+        proc = subprocess.run(
+            [ffmpeg_path, "-hide_banner", "-encoders"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=15,
+        )
+    except Exception:
+        return None
+    # Lines look like " V....D h264_nvenc   NVIDIA NVENC H.264 encoder"
+    listed = set()
+    for ln in proc.stdout.decode("utf-8", errors="replace").splitlines():
+        parts = ln.split()
+        if len(parts) > 1:
+            listed.add(parts[1])
+    for name in _HW_H264_ARGS:
+        if name in listed:
+            return name
+    return None
 
 
 def ffmpeg_concat_segments(
@@ -160,41 +228,53 @@ def ffmpeg_concat_segments(
         log.error("ffmpeg_concat_segments: no segments provided")
         return False
 
-    work_dir.mkdir(parents=True, exist_ok=True)
+    # ffmpeg runs with cwd=work_dir, so every path it sees must be absolute; a relative
+    # --output/--scratch_root would otherwise resolve against the wrong directory.
+    work_dir = Path(work_dir).resolve()
+    segments = [Path(seg).resolve() for seg in segments]
+    output_file = Path(output_file).resolve()
+    _ensure_dir(work_dir)
     list_file = work_dir / "concat_list.txt"
+    body = "ffconcat version 1.0\n" + "".join(f"file '{_ffconcat_escape_path(seg)}'\n" for seg in segments)
     try:
-        with open(list_file, "w", encoding="utf-8") as f:
-            f.write("ffconcat version 1.0\n")
-            for seg in segments:
-                f.write(f"file '{_ffconcat_escape_path(seg)}'\n")
+        list_file.write_bytes(body.encode("utf-8"))
     except Exception as e:
         log.error("Failed to write ffmpeg concat list: %s", e)
         return False
 
-    def _run(cmd: List[str]) -> Tuple[bool, str]:
+    def _run(cmd: List[str]) -> bool:
+        # Output stays bytes: it's only decoded when ffmpeg fails and we actually log it.
         try:
             proc = subprocess.run(
                 cmd,
                 cwd=str(work_dir),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
+                bufsize=1 << 20,
             )
-            out = proc.stdout or ""
-            ok = proc.returncode == 0
-            if not ok:
-                log.warning("ffmpeg failed (rc=%s). Output:\n%s", proc.returncode, out)
-            else:
-                log.info("ffmpeg ok. Output:\n%s", out)
-            return ok, out
+            out = proc.stdout or b""
+            if proc.returncode != 0:
+                log.warning(
+                    "ffmpeg failed (rc=%s). Output:\n%s",
+                    proc.returncode,
+                    out.decode("utf-8", errors="replace"),
+                )
+                return False
+            log.info("ffmpeg ok (rc=0, %d bytes of log)", len(out))
+            return True
         except Exception as e:
             log.error("ffmpeg invocation error: %s", e)
-            return False, str(e)
+            return False
 
-    # 1) stream copy
-    copy_cmd = [
+    ext = output_file.suffix.lower()
+    # Faststart helps for mov/mp4.
+    faststart = ["-movflags", "+faststart"] if ext in (".mov", ".mp4") else []
+    out_tail = faststart + [str(output_file)]
+    base = [
         ffmpeg_path,
         "-hide_banner",
+        "-loglevel",
+        "warning",
         "-y",
         "-f",
         "concat",
@@ -204,85 +284,54 @@ def ffmpeg_concat_segments(
         str(list_file),
         "-map",
         "0",
-        "-c",
-        "copy",
     ]
-    # Faststart helps for mov/mp4.
-    if output_file.suffix.lower() in (".mov", ".mp4"):
-        copy_cmd += ["-movflags", "+faststart"]
-    copy_cmd += [str(output_file)]
 
+    # 1) stream copy
+    copy_cmd = base + ["-c", "copy"] + out_tail
     log.info("ffmpeg concat (stream-copy): %s", " ".join(copy_cmd))
-    ok, _ = _run(copy_cmd)
-    if ok:
+    if _run(copy_cmd):
         return True
 
     if not allow_reencode:
         return False
 
     # 2) re-encode fallback
-    ext = output_file.suffix.lower()
     if ext == ".mov":
         # Reasonable ProRes HQ fallback.
         vcodec = ["-c:v", "prores_ks", "-profile:v", "3", "-pix_fmt", "yuv422p10le"]
         # Try to copy audio first; if that fails we'll re-encode audio too.
         acodec_primary = ["-c:a", "copy"]
         acodec_fallback = ["-c:a", "pcm_s16le"]
-    elif ext == ".mp4":
-        vcodec = ["-c:v", "libx264", "-crf", "18", "-preset", "slow", "-pix_fmt", "yuv420p"]
-        acodec_primary = ["-c:a", "copy"]
-        acodec_fallback = ["-c:a", "aac", "-b:a", "320k"]
     else:
-        # Generic safe defaults.
+        # .mp4 and generic safe defaults.
         vcodec = ["-c:v", "libx264", "-crf", "18", "-preset", "slow", "-pix_fmt", "yuv420p"]
         acodec_primary = ["-c:a", "copy"]
         acodec_fallback = ["-c:a", "aac", "-b:a", "320k"]
 
-    reenc_cmd = [
-        ffmpeg_path,
-        "-hide_banner",
-        "-y",
-        "-f",
-        "concat",
-        "-safe",
-        "0",
-        "-i",
-        str(list_file),
-        "-map",
-        "0",
-    ] + vcodec + acodec_primary
-    if output_file.suffix.lower() in (".mov", ".mp4"):
-        reenc_cmd += ["-movflags", "+faststart"]
-    reenc_cmd += [str(output_file)]
-
-    log.info("ffmpeg concat (re-encode): %s", " ".join(reenc_cmd))
-    ok, _ = _run(reenc_cmd)
-    if ok:
-        return True
+    # Hardware H.264 is much faster for these intermediates. An encoder being listed
+    # doesn't guarantee a usable device, so libx264 stays as the next attempt.
+    vcodecs = [vcodec]
+    if ext == ".mp4":
+        hw = _detect_hw_encoder(ffmpeg_path)
+        if hw:
+            vcodecs.insert(0, list(_HW_H264_ARGS[hw]))
 
-    # 3) re-encode audio too
-    reenc_cmd2 = [
-        ffmpeg_path,
-        "-hide_banner",
-        "-y",
-        "-f",
-        "concat",
-        "-safe",
-        "0",
-        "-i",
-        str(list_file),
-        "-map",
-        "0",
-    ] + vcodec + acodec_fallback
-    if output_file.suffix.lower() in (".mov", ".mp4"):
-        reenc_cmd2 += ["-movflags", "+faststart"]
-    reenc_cmd2 += [str(output_file)]
+    for vcodec in vcodecs:
+        reenc_cmd = base + vcodec + acodec_primary + out_tail
+        log.info("ffmpeg concat (re-encode, %s): %s", vcodec[1], " ".join(reenc_cmd))
+        if _run(reenc_cmd):
+            return True
 
-    log.info("ffmpeg concat (re-encode v+a): %s", " ".join(reenc_cmd2))
-    ok, _ = _run(reenc_cmd2)
-    return ok
+        # 3) re-encode audio too
+        reenc_cmd2 = base + vcodec + acodec_fallback + out_tail
+        log.info("ffmpeg concat (re-encode v+a, %s): %s", vcodec[1], " ".join(reenc_cmd2))
+        if _run(reenc_cmd2):
+            return True
 
+    return False
 
+
+@functools.lru_cache(maxsize=1)
 def _popen_kwargs_for_child() -> dict:
     """Platform-specific kwargs so we can reliably terminate aerender and its child processes."""
     if os.name == "nt":
@@ -314,11 +363,12 @@ def _terminate_process_tree(proc: subprocess.Popen | None, logger: logging.Logge
         logger.exception("Failed to send graceful termination to child.")
         return
 
-    t0 = time.time()
-    while time.time() - t0 < grace_sec:
-        if proc.poll() is not None:
-            return
-        time.sleep(0.2)
+    # One blocking wait returns the moment the child exits, instead of polling.
+    try:
+        proc.wait(timeout=grace_sec)
+        return
+    except subprocess.TimeoutExpired:
+        pass
 
     # Hard kill
     try:
@@ -341,26 +391,85 @@ def _terminate_process_tree(proc: subprocess.Popen | None, logger: logging.Logge
                 proc.kill()
     except Exception:
         logger.exception("Failed to hard-kill child.")
+        return
+
+    # Reap it so it doesn't linger as a zombie.
+    try:
+        proc.wait(timeout=2.0)
+    except subprocess.TimeoutExpired:
+        logger.warning("Child pid=%s still running after hard kill.", proc.pid)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_env_cached(path: str, mtime_ns: int) -> Tuple[Tuple[str, str], ...]:
+    # Keyed on mtime so an edited file is re-read; the tuple keeps the cached value immutable.
+    raw = Path(path).read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return tuple((str(k), str(v)) for k, v in data.items())
 
 
 def load_env_overrides(env_file: Optional[str]) -> Dict[str, str]:
     if not env_file:
         return {}
     p = Path(env_file)
-    if not p.exists():
+    try:
+        mtime_ns = p.stat().st_mtime_ns
+    except OSError:
         return {}
-    with p.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    return {str(k): str(v) for k, v in data.items()}
+    return dict(_load_env_cached(str(p), mtime_ns))
+
+
+# Directories this process already created or confirmed. On network scratch/output roots each
+# mkdir(parents=True) is several round trips, so repeat requests skip the syscalls entirely.
+_known_dirs: set[str] = set()
+
+
+def _ensure_dir(p) -> None:
+    sp = os.fspath(p)
+    if sp in _known_dirs:
+        return
+    os.makedirs(sp, exist_ok=True)
+    _known_dirs.add(sp)
+
 
+def _forget_dirs(root) -> None:
+    """Drop root and everything under it from the cache (call after removing the tree)."""
+    sr = os.fspath(root)
+    prefix = sr.rstrip("/\\") + os.sep
+    for d in [d for d in _known_dirs if d == sr or d.startswith(prefix)]:
+        _known_dirs.discard(d)
 
-def stream_reader(pid: int, stream, out_q: queue.Queue, tag: str):
-    """Read lines from child stream and push to queue for the main loop to log."""
+
+def _take_lines(buf: bytearray) -> List[bytes]:
+    """
+    Pop the complete lines off the front of `buf`, splitting on \n, \r and \r\n (aerender
+    separates progress updates with bare \r). The unterminated tail, or a lone trailing \r
+    that may be half of \r\n, stays in `buf` for the next read. Both the POSIX pump and the
+    Windows reader threads use this, so children's lines come out the same on every OS.
+    """
+    end = max(buf.rfind(b"\n"), buf.rfind(b"\r"))
+    if end == len(buf) - 1 and buf[end] == 0x0D:
+        end = max(buf.rfind(b"\n", 0, end), buf.rfind(b"\r", 0, end))
+    if end < 0:
+        return []
+    complete = bytes(buf[:end + 1])
+    del buf[:end + 1]
+    return complete.splitlines()
+
+
+def stream_reader(pid: int, stream, out_q: queue.Queue, tag: str, encoding: str = "utf-8"):
+    """Read lines from a binary child stream and push them, decoded, to queue for the main loop to log."""
+    buf = bytearray()
+    # read1 returns whatever the pipe has (up to 64 KiB) instead of waiting for a \n, so
+    # \r-separated progress lines are handed over as they arrive.
+    read = getattr(stream, "read1", stream.read)
     try:
-        for line in iter(stream.readline, ""):
-            if not line:
-                break
-            out_q.put((pid, tag, line.rstrip("\n")))
+        for chunk in iter(lambda: read(65536), b""):
+            buf += chunk
+            for ln in _take_lines(buf):
+                out_q.put((pid, tag, ln.decode(encoding, errors="replace")))
+        if buf:
+            out_q.put((pid, tag, bytes(buf).rstrip(b"\r\n").decode(encoding, errors="replace")))
     finally:
         try:
             stream.close()
@@ -368,6 +477,142 @@ def stream_reader(pid: int, stream, out_q: queue.Queue, tag: str):
             pass
 
 
+try:
+    import fcntl
+
+    _F_SETPIPE_SZ: Optional[int] = getattr(fcntl, "F_SETPIPE_SZ", 1031) if sys.platform.startswith("linux") else None
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+    _F_SETPIPE_SZ = None
+
+
+class ChildOutputPump:
+    """
+    Collects (pid, tag, line) tuples from child stdout/stderr pipes.
+
+    POSIX: every pipe fd is registered with one selectors.DefaultSelector (epoll/kqueue) and read
+    non-blocking from the monitor thread, so no reader thread per stream is needed.
+    Windows: anonymous pipes can't be select()ed, so each stream keeps a stream_reader thread.
+
+    On Linux a pidfd per child can be registered too (watch_exit); it becomes readable the
+    moment the child exits, so drain() also reports exits and the monitor needn't poll().
+    """
+
+    def __init__(self) -> None:
+        self._sel: Optional[selectors.BaseSelector] = selectors.DefaultSelector() if os.name != "nt" else None
+        self._q: queue.Queue = queue.Queue()
+        # Per-fd unterminated tail, and one reusable read slab: os.readv fills the slab in place,
+        # so a read allocates nothing and line splitting happens in C on the bytearray.
+        self._partial: Dict[int, bytearray] = {}
+        self._slab = bytearray(65536)
+        self._slab_mv = memoryview(self._slab)
+        self._exited: set[int] = set()
+        # Pipes are binary; complete lines are decoded with the codec text=True would have used.
+        self._encoding = locale.getpreferredencoding(False)
+
+    def add(self, pid: int, stream, tag: str) -> None:
+        if self._sel is None:
+            threading.Thread(
+                target=stream_reader, args=(pid, stream, self._q, tag, self._encoding), daemon=True
+            ).start()
+            return
+        fd = stream.fileno()
+        os.set_blocking(fd, False)
+        if _F_SETPIPE_SZ is not None:
+            # A 1 MiB kernel pipe (default is 64 KiB) means a chatty aerender never blocks on write
+            # while the monitor is busy. Best-effort: capped by /proc/sys/fs/pipe-max-size.
+            try:
+                fcntl.fcntl(fd, _F_SETPIPE_SZ, 1 << 20)
+            except OSError:
+                pass
+        self._partial[fd] = bytearray()
+        self._sel.register(fd, selectors.EVENT_READ, (pid, tag, stream))
+
+    def watch_exit(self, pid: int) -> bool:
+        """Register a pidfd for pid; False when unsupported (non-Linux, old kernel/Python)."""
+        if self._sel is None or not hasattr(os, "pidfd_open"):
+            return False
+        try:
+            fd = os.pidfd_open(pid, 0)
+        except OSError:
+            return False
+        self._sel.register(fd, selectors.EVENT_READ, (pid, None, None))
+        return True
+
+    def take_exited(self) -> set[int]:
+        """Return (and clear) the pids whose exit was reported since the last call."""
+        exited, self._exited = self._exited, set()
+        return exited
+
+    def drain(self, timeout: float = 0.0) -> List[Tuple[int, str, str]]:
+        """Return complete lines available now (waiting up to `timeout` seconds for the first)."""
+        out: List[Tuple[int, str, str]] = []
+        if self._sel is None:
+            # Block on the queue itself so a line is handed over the moment a reader thread
+            # posts it, rather than after a fixed sleep.
+            try:
+                out.append(self._q.get(timeout=timeout) if timeout > 0 else self._q.get_nowait())
+            except queue.Empty:
+                return out
+            # We're the only consumer, so everything qsize() reports can be taken without
+            # another Empty exception.
+            for _ in range(self._q.qsize()):
+                out.append(self._q.get_nowait())
+            return out
+
+        if not self._sel.get_map():
+            # Every pipe hit EOF; still honour the wait so callers don't spin.
+            if timeout > 0:
+                time.sleep(timeout)
+            return out
+        for key, _ in self._sel.select(timeout):
+            pid, tag, stream = key.data
+            fd = key.fd
+            if tag is None:
+                # pidfd: the child has exited.
+                self._exited.add(pid)
+                self._unregister(fd, None)
+                continue
+            try:
+                n = os.readv(fd, [self._slab_mv])
+            except BlockingIOError:
+                continue
+            except OSError:
+                n = 0
+            buf = self._partial[fd]
+            if not n:
+                # EOF: flush any unterminated last line and stop watching this pipe.
+                if buf:
+                    out.append((pid, tag, bytes(buf).rstrip(b"\r\n").decode(self._encoding, errors="replace")))
+                self._unregister(fd, stream)
+                continue
+            buf += self._slab_mv[:n]
+            for ln in _take_lines(buf):
+                out.append((pid, tag, ln.decode(self._encoding, errors="replace")))
+        return out
+
+    def _unregister(self, fd: int, stream) -> None:
+        try:
+            self._sel.unregister(fd)  # type: ignore[union-attr]
+        except Exception:
+            pass
+        self._partial.pop(fd, None)
+        try:
+            if stream is None:
+                os.close(fd)  # pidfd
+            else:
+                stream.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        if self._sel is None:
+            return
+        for key in list(self._sel.get_map().values()):
+            self._unregister(key.fd, key.data[2])
+        self._sel.close()
+
+
 # -----------------------------
 # Helpers: chunking / splitting
 # -----------------------------
@@ -379,18 +624,14 @@ def split_ranges(start: int, end: int, parts: int) -> List[Tuple[int, int]]:
     if parts > total:
         parts = total
 
-    base = total // parts
-    rem = total % parts
+    base, rem = divmod(total, parts)
 
-    ranges: List[Tuple[int, int]] = []
-    cur = start
-    for i in range(parts):
-        span = base + (1 if i < rem else 0)
-        s = cur
-        e = cur + span - 1
-        ranges.append((s, e))
-        cur = e + 1
-    return ranges
+    # Closed form: the first `rem` ranges get one extra frame, so range i starts at
+    # start + i*base + min(i, rem). No running cursor needed.
+    return [
+        (start + i * base + min(i, rem), start + (i + 1) * base + min(i + 1, rem) - 1)
+        for i in range(parts)
+    ]
 
 
 # -----------------------------
@@ -402,6 +643,145 @@ def _is_unc_path(p: str) -> bool:
     return p.startswith("\\\\") or p.startswith("//")
 
 
+_FICLONE = 0x40049409  # Linux ioctl: share src extents with dst (Btrfs/XFS/...)
+
+
+def _try_clone_file(src: Path, dest: Path) -> bool:
+    """
+    Copy-on-write clone src -> dest when both live on the same volume (APFS clonefile,
+    Linux FICLONE). Metadata-only, so O(1) regardless of file size. Returns False (leaving
+    no partial dest behind) whenever cloning isn't possible, so the caller can fall back.
+    """
+    try:
+        if os.stat(src).st_dev != os.stat(dest.parent).st_dev:
+            return False
+    except OSError:
+        return False
+
+    # Clone into a sibling temp and rename it over dest only once the clone worked, so an
+    # existing good dest is never removed or truncated by an attempt that then fails.
+    tmp = dest.with_name(f".{dest.name}.stmpo-clone-{os.getpid()}")
+    cloned = False
+    try:
+        if sys.platform == "darwin":
+            import ctypes
+            import ctypes.util
+
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.dylib", use_errno=True)
+            if os.path.lexists(tmp):
+                os.unlink(tmp)  # clonefile() refuses to overwrite
+            cloned = libc.clonefile(os.fsencode(str(src)), os.fsencode(str(tmp)), 0) == 0
+
+        elif sys.platform.startswith("linux"):
+            import fcntl
+
+            with open(src, "rb") as fsrc, open(tmp, "wb") as fdst:
+                try:
+                    fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                except OSError:
+                    pass
+                else:
+                    cloned = True
+            if cloned:
+                shutil.copystat(str(src), str(tmp))
+
+        if cloned:
+            os.replace(tmp, dest)
+            return True
+    except Exception:
+        cloned = False
+    finally:
+        if not cloned:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+    return False
+
+
+_COPY_BUFSIZE = 4 * 1024 * 1024
+_COPY_FILE_NO_BUFFERING = 0x00001000  # CopyFileExW: skip the cache for one-shot copies
+_UNBUFFERED_MIN_SIZE = 1 << 30  # below this the cache helps more than it costs
+
+
+def _fast_copyfile(src: Path, dest: Path) -> None:
+    """
+    shutil.copy2 replacement for the non-CoW case. Uses CopyFileExW on Windows (unbuffered,
+    SMB friendly, for files of 1 GiB and up), fcopyfile() via shutil on macOS, an
+    os.copy_file_range loop on Linux (the kernel may reflink or offload to the server), and
+    a preallocated 4 MiB buffered loop elsewhere. Timestamps and mode are carried over like
+    copy2.
+    """
+    size = os.stat(src).st_size
+
+    if sys.platform == "win32":
+        import ctypes
+
+        flags = _COPY_FILE_NO_BUFFERING if size >= _UNBUFFERED_MIN_SIZE else 0
+        ok = ctypes.windll.kernel32.CopyFileExW(str(src), str(dest), None, None, None, flags)
+        if ok:
+            return  # CopyFileExW already preserves attributes and timestamps
+        # fall through to the portable loop (e.g. unbuffered I/O refused by the target)
+    elif sys.platform == "darwin":
+        # copyfile() stays in the kernel (fcopyfile) and may clone on APFS.
+        shutil.copyfile(str(src), str(dest))
+        shutil.copystat(str(src), str(dest))
+        return
+
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        done = False
+        if hasattr(os, "copy_file_range"):
+            try:
+                in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+                copied = 0
+                while True:
+                    n = os.copy_file_range(in_fd, out_fd, 1 << 30)
+                    if not n:
+                        break
+                    copied += n
+                # Some filesystems return 0 straight away for copies they can't do instead of
+                # failing, so only a full-length copy counts.
+                done = copied >= size
+            except OSError:
+                # EXDEV/ENOSYS/EINVAL on older kernels or odd filesystems: restart plainly.
+                pass
+            if not done:
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        if not done:
+            if size and hasattr(os, "posix_fallocate"):
+                # Reserve the whole extent up front so large renders don't fragment.
+                try:
+                    os.posix_fallocate(fdst.fileno(), 0, size)
+                except OSError:
+                    pass
+            shutil.copyfileobj(fsrc, fdst, length=_COPY_BUFSIZE)
+            fdst.truncate()  # in case src shrank while copying
+    shutil.copystat(str(src), str(dest))
+
+
+def _move_to_final(src: Path, dst: Path, logger: logging.Logger) -> None:
+    """
+    Deliver a finished scratch file to its destination. Scratch is deleted afterwards, so on
+    the same volume a rename is enough (O(1), any OS); otherwise try a CoW clone, then copy.
+    """
+    try:
+        same_fs = os.stat(src).st_dev == os.stat(dst.parent).st_dev
+    except OSError:
+        same_fs = False
+    if same_fs:
+        try:
+            os.replace(src, dst)
+            logger.info(f"Moved output into place: {dst}")
+            return
+        except OSError:
+            pass  # e.g. dst locked on Windows; copy instead
+    if _try_clone_file(src, dst):
+        return
+    _fast_copyfile(src, dst)
+
+
 def stage_project_to_local(project_path: str, local_scratch_dir: Path, logger: logging.Logger) -> str:
     """
     Best-effort copy of the .aep/.aepx into local scratch.
@@ -423,7 +803,7 @@ def stage_project_to_local(project_path: str, local_scratch_dir: Path, logger: l
             return project_path
 
         staging_dir = local_scratch_dir / "_project"
-        staging_dir.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(staging_dir)
         dest = staging_dir / src.name
 
         # If already staged, keep it
@@ -436,7 +816,10 @@ def stage_project_to_local(project_path: str, local_scratch_dir: Path, logger: l
 
         for attempt in range(1, 4):
             try:
-                shutil.copy2(str(src), str(dest))
+                if _try_clone_file(src, dest):
+                    logger.info(f"Staged project locally (clone): {src} -> {dest}")
+                    return str(dest)
+                _fast_copyfile(src, dest)
                 logger.info(f"Staged project locally: {src} -> {dest}")
                 return str(dest)
             except Exception as ex:
@@ -476,36 +859,48 @@ def get_total_ram_native(logger: logging.Logger) -> float:
 
     # 2. Native Fallbacks (The "Authoritative" Backup)
     try:
-        # WINDOWS: Use WMI (Windows Management Instrumentation)
+        # WINDOWS: GlobalMemoryStatusEx (in-process kernel32 call; no wmic/WMI process spawn)
         if sys.platform == "win32":
-            # 'wmic' is standard on all Windows versions (XP through 11/Server)
-            cmd = ["wmic", "computersystem", "get", "TotalPhysicalMemory"]
-            # Output format:
-            # TotalPhysicalMemory
-            # 34359738368
-            out = subprocess.check_output(cmd, text=True).strip().split('\n')
-            for line in out:
-                clean = line.strip()
-                if clean.isdigit():
-                    return float(clean) / (1024 ** 3)
-
-        # MACOS: Use sysctl (System Control)
+            import ctypes
+
+            class _MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [
+                    ("dwLength", ctypes.c_ulong),
+                    ("dwMemoryLoad", ctypes.c_ulong),
+                    ("ullTotalPhys", ctypes.c_uint64),
+                    ("ullAvailPhys", ctypes.c_uint64),
+                    ("ullTotalPageFile", ctypes.c_uint64),
+                    ("ullAvailPageFile", ctypes.c_uint64),
+                    ("ullTotalVirtual", ctypes.c_uint64),
+                    ("ullAvailVirtual", ctypes.c_uint64),
+                    ("ullAvailExtendedVirtual", ctypes.c_uint64),
+                ]
+
+            stat = _MEMORYSTATUSEX()
+            stat.dwLength = ctypes.sizeof(stat)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(stat)):  # type: ignore[attr-defined]
+                return float(stat.ullTotalPhys) / (1024 ** 3)
+
+        # MACOS: sysctlbyname("hw.memsize") via libc (no sysctl process spawn)
         elif sys.platform == "darwin":
-            # 'hw.memsize' is the kernel parameter for physical RAM
-            cmd = ["sysctl", "-n", "hw.memsize"]
-            out = subprocess.check_output(cmd, text=True).strip()
-            if out.isdigit():
-                return float(out) / (1024 ** 3)
+            import ctypes
+            import ctypes.util
+
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.dylib", use_errno=True)
+            size = ctypes.c_uint64(0)
+            length = ctypes.c_size_t(ctypes.sizeof(size))
+            if libc.sysctlbyname(b"hw.memsize", ctypes.byref(size), ctypes.byref(length), None, ctypes.c_size_t(0)) == 0:
+                return float(size.value) / (1024 ** 3)
 
         # LINUX: Use /proc/meminfo (Standard Kernel Interface)
         elif sys.platform.startswith("linux"):
             with open("/proc/meminfo", "r") as f:
-                for line in f:
-                    if "MemTotal" in line:
-                        # Format: MemTotal:        16326644 kB
-                        parts = line.split()
-                        # Convert kB to GB
-                        return float(parts[1]) / (1024 * 1024)
+                txt = f.read()
+            # Format: MemTotal:        16326644 kB
+            m = re.search(r"^MemTotal:\s+(\d+)", txt, re.MULTILINE)
+            if m:
+                # Convert kB to GB
+                return float(m.group(1)) / (1024 * 1024)
 
     except Exception as ex:
         logger.debug(f"Native RAM detection failed: {ex}")
@@ -569,7 +964,8 @@ def load_numa_nodes(numa_map_path: str, logger: logging.Logger) -> Dict[str, Lis
     if not p.exists():
         return {}
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
+        raw = p.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
     except Exception as ex:
         logger.warning(f"Failed to read NUMA map {p}: {ex}")
         return {}
@@ -591,45 +987,244 @@ def load_numa_nodes(numa_map_path: str, logger: logging.Logger) -> Dict[str, Lis
     return out
 
 
+def _usable_cpus() -> Optional[set[int]]:
+    """CPUs this process may run on (honours cpusets/isolcpus/taskset), or None if unknown."""
+    if hasattr(os, "sched_getaffinity"):
+        try:
+            return set(os.sched_getaffinity(0))
+        except OSError:
+            pass
+    if psutil is not None:
+        try:
+            return set(psutil.Process().cpu_affinity())  # type: ignore[attr-defined]
+        except Exception:
+            pass
+    return None
+
+
+def _restrict_to_usable_cpus(pools: List[List[int]], logger: logging.Logger) -> List[List[int]]:
+    """
+    Drop CPUs from the NUMA map that this process can't use (isolated, outside the cpuset,
+    or nonexistent). Pinning a child to them would fail or pile it onto the remainder.
+    """
+    usable = _usable_cpus()
+    if usable is None:
+        return pools
+    out = [[c for c in cpus if c in usable] for cpus in pools]
+    dropped = sum(len(a) - len(b) for a, b in zip(pools, out))
+    if dropped:
+        logger.info("NUMA map: ignoring %s CPU(s) not available to this process.", dropped)
+    return [cpus for cpus in out if cpus]
+
+
+def _split_cpus(cpus: List[int], parts: int) -> List[List[int]]:
+    """Split one node's CPUs into `parts` contiguous, near-equal blocks (CPUs shared if parts > CPUs)."""
+    if parts > len(cpus):
+        return [[cpus[j % len(cpus)]] for j in range(parts)]
+    base, rem = divmod(len(cpus), parts)
+    blocks: List[List[int]] = []
+    cur = 0
+    for j in range(parts):
+        span = base + (1 if j < rem else 0)
+        blocks.append(cpus[cur:cur + span])
+        cur += span
+    return blocks
+
+
 def build_affinity_blocks(concurrency: int, pools: List[List[int]]) -> List[List[int]]:
+    """
+    Assign CPUs to `concurrency` children, treating each pool as a NUMA node.
+
+    Children are distributed round-robin across nodes and each child's CPUs come from a
+    single node (contiguous block), so aerender never straddles sockets. With fewer
+    children than nodes, each child gets whole nodes instead so no CPU is left unused.
+
+    Returns exactly `concurrency` blocks (index i is child i), or [] when no CPUs are known.
+    """
     if concurrency <= 0:
         return []
-    all_cpus: List[int] = []
+    seen: set[int] = set()
+    nodes: List[List[int]] = []
     for p in pools:
-        all_cpus.extend(p)
-    all_cpus = list(dict.fromkeys(all_cpus))
-    if not all_cpus:
+        cpus = [c for c in dict.fromkeys(p) if c not in seen]
+        seen.update(cpus)
+        if cpus:
+            nodes.append(cpus)
+    if not nodes:
         return []
 
-    blocks: List[List[int]] = [[] for _ in range(concurrency)]
-    for i, cpu in enumerate(all_cpus):
-        blocks[i % concurrency].append(cpu)
-    return blocks
+    n_nodes = len(nodes)
+    if concurrency <= n_nodes:
+        blocks: List[List[int]] = [[] for _ in range(concurrency)]
+        for i, cpus in enumerate(nodes):
+            blocks[i % concurrency].extend(cpus)
+        return blocks
 
+    # Child i runs on node i % n_nodes, taking that node's (i // n_nodes)-th block.
+    per_node = [_split_cpus(cpus, len(range(n, concurrency, n_nodes))) for n, cpus in enumerate(nodes)]
+    return [per_node[i % n_nodes][i // n_nodes] for i in range(concurrency)]
 
-def apply_affinity(proc_obj, affinity: Optional[List[int]], logger: logging.Logger) -> Optional[List[int]]:
-    if not affinity:
+
+def _affinity_supported() -> bool:
+    if hasattr(os, "sched_setaffinity") or os.name == "nt":
+        return True
+    return psutil is not None and hasattr(psutil.Process, "cpu_affinity")
+
+
+@functools.lru_cache(maxsize=1)
+def _kernel32_affinity():
+    """
+    Private kernel32 handle with prototypes for the affinity calls. Without restype the
+    HANDLE from OpenProcess is truncated to a C int on 64-bit Windows; a separate WinDLL
+    keeps these declarations from leaking into ctypes.windll.kernel32 users.
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    k32.OpenProcess.restype = wintypes.HANDLE
+    k32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    k32.SetProcessAffinityMask.restype = wintypes.BOOL
+    k32.SetProcessAffinityMask.argtypes = (wintypes.HANDLE, ctypes.c_size_t)
+    k32.CloseHandle.restype = wintypes.BOOL
+    k32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    return k32
+
+
+def _set_affinity_win32(pid: int, cpus: List[int]) -> bool:
+    # SetProcessAffinityMask only addresses the caller's processor group (64 CPUs).
+    if max(cpus) >= 64:
+        return False
+    kernel32 = _kernel32_affinity()
+    PROCESS_SET_INFORMATION = 0x0200
+    PROCESS_QUERY_INFORMATION = 0x0400
+    h = kernel32.OpenProcess(PROCESS_SET_INFORMATION | PROCESS_QUERY_INFORMATION, False, int(pid))
+    if not h:
+        return False
+    try:
+        mask = 0
+        for c in cpus:
+            mask |= 1 << c
+        return bool(kernel32.SetProcessAffinityMask(h, mask))
+    finally:
+        kernel32.CloseHandle(h)
+
+
+def _clean_cpu_list(affinity: List[int]) -> List[int]:
+    cleaned: List[int] = []
+    for cpu in affinity:
+        try:
+            cid = int(cpu)
+        except Exception:
+            continue
+        if cid >= 0 and cid not in cleaned:
+            cleaned.append(cid)
+    return cleaned
+
+
+_MPOL_DEFAULT = 0
+
+
+@functools.lru_cache(maxsize=1)
+def _libnuma():
+    """libnuma via ctypes when installed and the kernel supports NUMA, else None."""
+    if not sys.platform.startswith("linux"):
         return None
-    if psutil is None:
+    try:
+        import ctypes
+
+        lib = ctypes.CDLL("libnuma.so.1")
+        if lib.numa_available() < 0:
+            return None
+        lib.get_mempolicy.argtypes = (
+            ctypes.POINTER(ctypes.c_int), ctypes.c_void_p, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong,
+        )
+        lib.set_mempolicy.argtypes = (ctypes.c_int, ctypes.c_void_p, ctypes.c_ulong)
+        return lib
+    except Exception:
         return None
 
+
+@contextlib.contextmanager
+def _spawn_pinned(affinity: Optional[List[int]], logger: logging.Logger):
+    """
+    Linux: bind the *calling thread* to `affinity` (and prefer its NUMA node for memory when
+    libnuma is present) around a Popen, so the child inherits both from its very first
+    instruction: exe load, CRT init and AE's early allocations all land node-local. Yields
+    the applied CPU list, or None when the caller should fall back to apply_affinity().
+
+    This is used instead of preexec_fn, which isn't safe while the offloader threads run.
+    Only the spawning thread is touched, and it's restored afterwards.
+    """
+    cpus = _clean_cpu_list(affinity) if affinity else []
+    if not cpus or not sys.platform.startswith("linux"):
+        yield None
+        return
     try:
-        p = proc_obj if hasattr(proc_obj, "cpu_affinity") else psutil.Process(proc_obj.pid)  # type: ignore
-        if not hasattr(p, "cpu_affinity"):
-            return None
+        saved = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, cpus)
+    except OSError as ex:
+        logger.debug(f"Pre-spawn affinity failed ({ex}); pinning after launch instead.")
+        yield None
+        return
 
-        cleaned: List[int] = []
-        for cpu in affinity:
+    numa = _libnuma()
+    preferred = False
+    if numa is not None:
+        try:
+            import ctypes
+
+            # Only steer memory when the thread is on the default policy; a runner started
+            # under numactl --interleave/--membind/--preferred keeps what it was given.
+            mode = ctypes.c_int(-1)
+            if numa.get_mempolicy(ctypes.byref(mode), None, 0, None, 0) == 0 and mode.value == _MPOL_DEFAULT:
+                node_ids = {numa.numa_node_of_cpu(c) for c in cpus}
+                if len(node_ids) == 1 and min(node_ids) >= 0:
+                    numa.numa_set_preferred(min(node_ids))
+                    preferred = True
+        except Exception:
+            pass
+    try:
+        yield cpus
+    finally:
+        if preferred:
             try:
-                cid = int(cpu)
+                # We only got here from MPOL_DEFAULT, so this restores exactly that.
+                numa.set_mempolicy(_MPOL_DEFAULT, None, 0)
             except Exception:
-                continue
-            if cid >= 0 and cid not in cleaned:
-                cleaned.append(cid)
+                pass
+        try:
+            os.sched_setaffinity(0, saved)
+        except OSError:
+            pass
+
+
+def apply_affinity(proc_obj, affinity: Optional[List[int]], logger: logging.Logger) -> Optional[List[int]]:
+    """
+    Pin proc_obj (Popen or psutil.Process) to the given CPUs. Goes straight to the OS call
+    (sched_setaffinity / SetProcessAffinityMask) and only falls back to psutil when neither
+    applies, so no psutil.Process is built per child and psutil isn't required.
+    """
+    if not affinity:
+        return None
 
+    try:
+        cleaned = _clean_cpu_list(affinity)
         if not cleaned:
             return None
 
+        pid = proc_obj.pid
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(pid, cleaned)
+            return cleaned
+        if os.name == "nt" and _set_affinity_win32(pid, cleaned):
+            return cleaned
+
+        if psutil is None:
+            return None
+        p = proc_obj if hasattr(proc_obj, "cpu_affinity") else psutil.Process(pid)  # type: ignore
+        if not hasattr(p, "cpu_affinity"):
+            return None
         p.cpu_affinity(cleaned)  # type: ignore
         return cleaned
     except Exception as ex:
@@ -648,33 +1243,63 @@ def offload_loop(
     stop_event: threading.Event,
     logger: logging.Logger,
     poll_sec: float = 0.75,
+    copy_workers: int = 4,
 ) -> None:
     copied: set[str] = set()
-    final_dir.mkdir(parents=True, exist_ok=True)
+    inflight: set[str] = set()
+    lock = threading.Lock()
+    _ensure_dir(final_dir)
 
-    while not stop_event.is_set():
+    def _copy(src: Path, dest: Path, key: str) -> None:
         try:
-            for p in local_dir.iterdir():
-                if not p.is_file():
-                    continue
-                if not matcher(p):
-                    continue
-                key = p.name.lower() if sys.platform == "win32" else p.name
-                if key in copied:
-                    continue
+            _fast_copyfile(src, dest)
+            with lock:
+                copied.add(key)
+        except Exception as ex:
+            logger.debug(f"Offload copy failed for {src.name}: {ex}")
+        finally:
+            with lock:
+                inflight.discard(key)
 
-                dest = final_dir / p.name
-                try:
-                    shutil.copy2(str(p), str(dest))
-                    copied.add(key)
-                except Exception as ex:
-                    logger.debug(f"Offload copy failed for {p.name}: {ex}")
+    # A few copies in flight overlap per-file latency on network destinations; the small
+    # pool bounds how many writes hit the NAS at once.
+    pool = ThreadPoolExecutor(max_workers=max(1, int(copy_workers)), thread_name_prefix="stmpo-offload")
+
+    def _sweep() -> None:
+        try:
+            # scandir hands back the entry type from the directory read itself, so a poll
+            # costs one listing rather than a listing plus a stat per file.
+            with os.scandir(local_dir) as it:
+                for de in it:
+                    # Names from one directory listing are already unique (case-insensitively
+                    # on Windows too), so the raw name is the key: no per-file casefold, and
+                    # the set lookup runs before the type check and the regex.
+                    key = de.name
+                    with lock:
+                        if key in copied or key in inflight:
+                            continue
+                    if not de.is_file(follow_symlinks=False):
+                        continue
+                    if not matcher(key):
+                        continue
+                    with lock:
+                        inflight.add(key)
+                    pool.submit(_copy, Path(de.path), final_dir / key, key)
 
         except Exception:
             pass
 
-        time.sleep(poll_sec)
+    try:
+        # Event.wait returns as soon as stop is requested instead of finishing a fixed sleep.
+        while True:
+            _sweep()
+            if stop_event.wait(poll_sec):
+                break
 
+        # Final sweep: frames finished between the last poll and the stop request.
+        _sweep()
+    finally:
+        pool.shutdown(wait=True)
     logger.info("Offloader stopped.")
 
 
@@ -682,40 +1307,55 @@ def offload_loop(
 # Aerender command builder
 # -----------------------------
 
-def build_aerender_cmd(
-    args: argparse.Namespace,
-    s: int,
-    e: int,
-    output_path: str,  # local path
-) -> List[str]:
+def _format_cmd(cmd: List[str]) -> str:
+    """Shell-quoted command line for logs (paths with spaces stay copy-pasteable)."""
+    return subprocess.list2cmdline(cmd) if os.name == "nt" else shlex.join(cmd)
+
+
+AerenderCmdBase = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
+
+
+def build_aerender_cmd_base(args: argparse.Namespace) -> AerenderCmdBase:
+    """
+    Everything in the aerender command line that doesn't depend on the child's range/output,
+    as (head, sound, tail). build_aerender_cmd splices -output before the sound flag and
+    -s/-e after it, so argv keeps the original order: project, output, sound, range, then the
+    option flags and '-mfr ON|OFF <percent>' last.
+    """
     # aerender supports -sound ON|OFF
     sound_flag = str(getattr(args, "sound", "ON") or "ON").upper()
     if sound_flag not in ("ON", "OFF"):
         sound_flag = "ON"
 
-    cmd: List[str] = [
-        args.aerender_path,
-        "-project", args.project,
-        "-output", output_path,
-        "-sound", sound_flag,
-        "-s", str(s),
-        "-e", str(e),
-    ]
+    head = (args.aerender_path, "-project", args.project)
+    sound = ("-sound", sound_flag)
 
+    tail: List[str] = []
     if args.comp:
-        cmd += ["-comp", args.comp]
+        tail += ["-comp", args.comp]
     if args.rqindex is not None:
-        cmd += ["-rqindex", str(args.rqindex)]
+        tail += ["-rqindex", str(args.rqindex)]
     if getattr(args, "rs_template", None):
-        cmd += ["-RStemplate", args.rs_template]
+        tail += ["-RStemplate", args.rs_template]
     if getattr(args, "om_template", None):
-        cmd += ["-OMtemplate", args.om_template]
+        tail += ["-OMtemplate", args.om_template]
 
     # MFR control: aerender supports '-mfr ON|OFF <percent>'
     mfr_flag = "OFF" if getattr(args, "disable_mfr", False) else "ON"
-    cmd += ["-mfr", mfr_flag, "100"]
+    tail += ["-mfr", mfr_flag, "100"]
 
-    return cmd
+    return head, sound, tuple(tail)
+
+
+def build_aerender_cmd(
+    base: AerenderCmdBase,
+    s: int,
+    e: int,
+    output_path: str,  # local path
+) -> List[str]:
+    """Full command for one child: the shared base around its output and frame range."""
+    head, sound, tail = base
+    return [*head, "-output", output_path, *sound, "-s", str(s), "-e", str(e), *tail]
 
 
 # -----------------------------
@@ -750,7 +1390,7 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--no_stage_project", dest="stage_project", action="store_false", help="Disable local project staging.")
 
     p.add_argument("--spawn_delay", type=float, default=2.0, help="Delay between child spawns.")
-    p.add_argument("--child_grace_sec", type=float, default=10.0, help="Seconds before warning about silent children.")
+    p.add_argument("--child_grace_sec", type=float, default=10.0, help="Seconds before warning about silent children (0 disables the warning).")
     p.add_argument("--kill_on_fail", action="store_true", default=False, help="If any child fails, terminate the rest.")
 
     p.add_argument("--disable_affinity", action="store_true", default=False, help="Disable CPU affinity.")
@@ -771,6 +1411,11 @@ def build_parser() -> argparse.ArgumentParser:
 # Entry
 # -----------------------------
 
+# Shortest monitor-loop wait, and the least a watchdog entry is pushed forward on re-arm.
+_MIN_WAIT_SEC = 0.05
+_MIN_WAIT_NS = int(_MIN_WAIT_SEC * 1e9)
+
+
 def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_aerender_fn) -> int:
     # Resolve aerender path
     args.aerender_path = resolve_aerender_fn(args.aerender_path, args.after_effects_dir, logger)
@@ -784,7 +1429,7 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
     # Ensure output dir exists
     final_output_path = Path(args.output)
     final_output_dir = final_output_path.parent
-    final_output_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(final_output_dir)
 
     # Decide if we can parallelize
     total_frames = args.end - args.start + 1
@@ -839,7 +1484,7 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
     local_output_path = final_output_path
 
     if use_scratch:
-        local_scratch_dir.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(local_scratch_dir)
         local_output_path = local_scratch_dir / final_output_path.name
         logger.info("Scratch enabled: %s", local_scratch_dir)
 
@@ -853,17 +1498,11 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
     if single_file_concat_mode and concurrency > 1:
         # Keep segments in a subfolder so the background offloader (if enabled) doesn't
         # try to copy partial segment files.
-        try:
-            if child_pid_file is not None and Path(child_pid_file).exists():
-                Path(child_pid_file).unlink()
-        except Exception:
-            pass
-
         if use_scratch:
             segment_dir = local_scratch_dir / "_segments"
         else:
             segment_dir = final_output_path.parent / f".stmpo_segments_{run_id}"
-        segment_dir.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(segment_dir)
 
         ext = final_output_path.suffix or ""
         base = final_output_path.stem or "render"
@@ -883,7 +1522,7 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
     stop_offload_event = threading.Event()
     offloader_thread: Optional[threading.Thread] = None
     if use_scratch:
-        matcher = build_output_matcher(str(final_output_path)) if output_is_seq else (lambda p: p.name.lower() == final_output_path.name.lower())
+        matcher = build_output_matcher(str(final_output_path)) if output_is_seq else functools.partial(_name_match, final_output_path.name.lower())
         offloader_thread = threading.Thread(
             target=offload_loop,
             args=(local_scratch_dir, final_output_dir, matcher, stop_offload_event, logger),
@@ -894,13 +1533,14 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
 
     # Affinity blocks
     affinities: List[Optional[List[int]]] = [None] * concurrency
-    if not args.disable_affinity and psutil is not None and hasattr(psutil.Process(), "cpu_affinity"):
+    if not args.disable_affinity and _affinity_supported():
         if args.numa_map:
             nodes = load_numa_nodes(args.numa_map, logger)
             pools = [v for _, v in sorted(nodes.items())] if nodes else []
+            pools = _restrict_to_usable_cpus(pools, logger)
             blocks = build_affinity_blocks(concurrency, pools)
             if blocks:
-                affinities = [b for b in blocks] + [None] * max(0, concurrency - len(blocks))
+                affinities = blocks  # one block per child slot; ranges never outnumber them
                 logger.info("Affinity blocks prepared: %s", len(blocks))
 
     # Environment
@@ -908,12 +1548,16 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
     child_env = dict(os.environ)
     child_env.update(env_overrides)
 
+    # Shared aerender arguments and per-child output path strings, computed once for the dry
+    # run and the spawn loop.
+    cmd_base = build_aerender_cmd_base(args)
+    child_out_strs = [str(p) for p in segment_outputs] if segment_outputs else [str(local_output_path)] * len(ranges)
+
     # Dry run: print commands and exit
     if args.dry_run:
         for i, (s, e) in enumerate(ranges):
-            child_out = segment_outputs[i] if segment_outputs else local_output_path
-            cmd = build_aerender_cmd(args, s, e, str(child_out))
-            logger.info("DRY RUN child[%s]: %s", i, " ".join(cmd))
+            cmd = build_aerender_cmd(cmd_base, s, e, child_out_strs[i])
+            logger.info("DRY RUN child[%s]: %s", i, _format_cmd(cmd))
         stop_offload_event.set()
         if offloader_thread:
             offloader_thread.join(timeout=1.0)
@@ -928,43 +1572,58 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
     try:
         if getattr(args, "pid_file", None):
             child_pid_file = Path(args.pid_file).with_name("children_pids.txt")
+            # Don't let a stop request see PIDs left over from a previous run.
+            if child_pid_file.exists():
+                child_pid_file.unlink()
     except Exception:
         child_pid_file = None
 
     pid_lock = threading.Lock()
     pid_set = set()
-
-    def _write_child_pid_file() -> None:
-        if not child_pid_file:
-            return
-        try:
-            child_pid_file.parent.mkdir(parents=True, exist_ok=True)
-            tmp = Path(str(child_pid_file) + ".tmp")
-            lines = []
-            for p in sorted(pid_set):
-                try:
-                    p_int = int(p)
-                    if p_int > 1:
-                        lines.append("pid=%d" % p_int)
-                except Exception:
-                    pass
-            tmp.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
-            os.replace(str(tmp), str(child_pid_file))
-        except Exception:
-            pass
+    # children_pids.txt is append-only, one plain pid per line. Each record is a single
+    # O_APPEND write(), so the file is always valid for stmpo_stop without temp+rename rewrites.
+    pid_fd: Optional[int] = None
+    # Set once the file is closed at shutdown; None alone would mean "open it on first write".
+    pid_file_closed = False
 
     def _add_pid(pid: int) -> None:
+        nonlocal pid_fd
         try:
             pid_int = int(pid)
         except Exception:
             return
-        if pid_int <= 1:
+        if pid_int <= 1 or not child_pid_file:
             return
         with pid_lock:
-            if pid_int in pid_set:
+            if pid_file_closed or pid_int in pid_set:
                 return
             pid_set.add(pid_int)
-        _write_child_pid_file()
+            try:
+                if pid_fd is None:
+                    _ensure_dir(child_pid_file.parent)
+                    pid_fd = os.open(str(child_pid_file), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                os.write(pid_fd, b"%d\n" % pid_int)
+            except Exception:
+                pass
+
+    def _sync_child_pid_file(close: bool = False) -> None:
+        nonlocal pid_fd, pid_file_closed
+        with pid_lock:
+            if close:
+                pid_file_closed = True
+            if pid_fd is None:
+                return
+            try:
+                os.fsync(pid_fd)
+            except OSError:
+                pass
+            if close:
+                # Under the lock, so a late descendant thread can't write to a reused fd.
+                try:
+                    os.close(pid_fd)
+                except OSError:
+                    pass
+                pid_fd = None
 
     def _capture_descendants_for_pid(pid: int, max_wait_sec: float = 1.5) -> None:
         if psutil is None:
@@ -1007,7 +1666,9 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
             except Exception:
                 pass
 
-    out_q: queue.Queue = queue.Queue()
+    pump = ChildOutputPump()
+    # True while every child has a pidfd in the pump; otherwise completion falls back to poll().
+    exit_watched = True
     stop_children_event = threading.Event()
 
     def cleanup_resources():
@@ -1021,10 +1682,15 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
         if offloader_thread and offloader_thread.is_alive():
             offloader_thread.join(timeout=2.0)
 
-        if use_scratch:
+        if use_scratch and offloader_thread and offloader_thread.is_alive():
+            # Copies are still in flight; deleting scratch now would lose frames that
+            # never reached the destination.
+            logger.warning(f"Offloader still copying; leaving scratch directory: {local_scratch_dir}")
+        elif use_scratch:
             # best-effort cleanup
             try:
                 shutil.rmtree(str(local_scratch_dir), ignore_errors=True)
+                _forget_dirs(local_scratch_dir)
             except Exception:
                 pass
 
@@ -1042,21 +1708,27 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
         if i > 0 and args.spawn_delay > 0:
             time.sleep(args.spawn_delay)
 
-        child_out = segment_outputs[i] if segment_outputs else local_output_path
-        cmd = build_aerender_cmd(args, s, e, str(child_out))
+        cmd = build_aerender_cmd(cmd_base, s, e, child_out_strs[i])
         logger.info("Launching child[%s] frames=%s-%s", i, s, e)
-        logger.info("CMD: %s", " ".join(cmd))
-
-        pop = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True,
-            env=child_env,
-        **_popen_kwargs_for_child(),
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("CMD: %s", _format_cmd(cmd))
+
+        # Pin before exec where possible so the child's first allocations are NUMA-local;
+        # elsewhere pin straight after spawn, before anything else runs in this loop.
+        child_aff = affinities[i]
+        with _spawn_pinned(child_aff, logger) as aff:
+            pop = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                # Binary pipes: no per-line decode/newline translation in the parent; ChildOutputPump
+                # splits raw chunks and decodes whole lines.
+                bufsize=1 << 20,
+                env=child_env,
+                **_popen_kwargs_for_child(),
+            )
+        if aff is None:
+            aff = apply_affinity(pop, child_aff, logger)
 
         # Emit a PID-bearing line so UIs can map ranges<->pids.
         logger.info("Launched child[%s] pid=%s frames=%s-%s", i, pop.pid, s, e)
@@ -1065,13 +1737,14 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
         if psutil is not None:
             try:
                 ps_proc = psutil.Process(pop.pid)
+                # Prime the CPU baseline so the first silent-child warning reports a real percentage.
+                ps_proc.cpu_percent(interval=None)
             except Exception:
                 ps_proc = None
 
-        aff = apply_affinity(ps_proc or pop, affinities[i] if i < len(affinities) else None, logger)
-
-        child = ChildProc(pop, (s, e), aff, ps_proc, time.time())
+        child = ChildProc(pop, (s, e), aff, ps_proc, time.monotonic_ns())
         children.append(child)
+        _add_pid(pop.pid)
 
         # Best-effort: capture descendant PIDs (e.g., aerendercore) shortly after spawn.
         try:
@@ -1081,79 +1754,129 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
             pass
 
 
-        # log streaming threads
+        # log streaming (selector on POSIX, reader threads on Windows)
         if pop.stdout:
-            threading.Thread(target=stream_reader, args=(pop.pid, pop.stdout, out_q, "STDOUT"), daemon=True).start()
+            pump.add(pop.pid, pop.stdout, "STDOUT")
         if pop.stderr:
-            threading.Thread(target=stream_reader, args=(pop.pid, pop.stderr, out_q, "STDERR"), daemon=True).start()
+            pump.add(pop.pid, pop.stderr, "STDERR")
+        exit_watched = pump.watch_exit(pop.pid) and exit_watched
+
+    def _forward_child_lines(batch: List[Tuple[int, str, str]]) -> None:
+        # "[pid TAG] line" is parsed by the UI (PROGRESS lines), so the format stays. The
+        # level check is done once per batch and formatting is left to logging (%-style).
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        info = logger.info
+        for pid, tag, line in batch:
+            info("[%s %s] %s", pid, tag, line)
+
+    # Every launched pid is on disk before we start waiting on the children.
+    _sync_child_pid_file()
 
     # Monitor loop
-    last_output_time: Dict[int, float] = {ch.popen.pid: time.time() for ch in children}
+    # All monitor-loop timestamps are integer time.monotonic_ns(): immune to wall-clock jumps,
+    # no float math, and the clock is read once per wake-up rather than per line/child.
+    now_ns = time.monotonic_ns()
+    last_output_ns: Dict[int, int] = {ch.popen.pid: now_ns for ch in children}
     failures: List[int] = []
+    # Children still running, by pid. Exits are removed as they're reaped, so the per-tick
+    # loops only ever visit live children and completion is simply "running is empty".
+    running: Dict[int, ChildProc] = {ch.popen.pid: ch for ch in children}
+    # --child_grace_sec <= 0 disables the watchdog; tiny positive values are raised to 1 s so
+    # deadlines can't come due on every pass and spin the loop.
+    grace_sec = float(args.child_grace_sec)
+    grace_ns = max(int(grace_sec * 1e9), 1_000_000_000) if grace_sec > 0 else 0
+    last_pid_refresh_ns = 0
+    # Silent-child watchdog: (deadline, pid) min-heap. Entries go stale when a child writes
+    # output or exits; they're fixed up lazily when popped, so a tick only touches children
+    # whose deadline actually passed.
+    watchdog: List[Tuple[int, int]] = [(last_output_ns[pid] + grace_ns, pid) for pid in running] if grace_ns else []
+    heapq.heapify(watchdog)
 
     while True:
-        # Drain output queue
-        drained = False
-        try:
-            while True:
-                pid, tag, line = out_q.get_nowait()
-                drained = True
-                last_output_time[pid] = time.time()
-                logger.info(f"[{pid} {tag}] {line}")
-        except queue.Empty:
-            pass
+        # Drain child output. This is also the loop's only wait: on POSIX it blocks in the
+        # selector until any child writes (or, with pidfds, exits), so lines are logged as they
+        # arrive. Without pidfds exits are polled, so the wait is capped at 150 ms.
+        if exit_watched:
+            wait = 2.0  # descendant-PID refresh cadence
+            if watchdog:
+                # Floored so an overdue head entry can never turn this into a zero-timeout spin.
+                wait = max(_MIN_WAIT_SEC, min(wait, (watchdog[0][0] - time.monotonic_ns()) / 1e9))
+        else:
+            wait = 0.15
+        batch = pump.drain(timeout=wait)
+        now_ns = time.monotonic_ns()
+        if batch:
+            for pid, _, _ in batch:
+                last_output_ns[pid] = now_ns
+            _forward_child_lines(batch)
 
         # Refresh descendant PIDs periodically so aerendercore is captured even if it spawns later.
         # This is best-effort and never blocks the render.
         try:
             if child_pid_file is not None and psutil is not None:
-                if 'last_pid_refresh' not in locals():
-                    last_pid_refresh = 0.0
-                if (time.time() - float(last_pid_refresh)) > 2.0:
-                    last_pid_refresh = time.time()
+                if now_ns - last_pid_refresh_ns > 2_000_000_000:
+                    last_pid_refresh_ns = now_ns
                     _refresh_descendants_once()
         except Exception:
             pass
 
 
         # Periodic silent-child warnings
-        now = time.time()
-        for ch in children:
-            if ch.popen.poll() is not None:
+        while watchdog and watchdog[0][0] <= now_ns:
+            _, pid = heapq.heappop(watchdog)
+            ch = running.get(pid)
+            if ch is None:
+                continue  # exited
+            due = last_output_ns.get(pid, ch.start_ns) + grace_ns
+            if due > now_ns:
+                # It wrote something since; re-arm, at least one poll interval out.
+                heapq.heappush(watchdog, (max(due, now_ns + _MIN_WAIT_NS), pid))
                 continue
-            last = last_output_time.get(ch.popen.pid, ch.start_time)
-            if now - last > float(args.child_grace_sec):
-                # warn once per interval
-                last_output_time[ch.popen.pid] = now
-                cpu = mem = "n/a"
-                if psutil is not None and ch.psutil_proc is not None:
-                    try:
-                        cpu = f"{ch.psutil_proc.cpu_percent(interval=0.0):.1f}%"
+            # warn once per interval
+            last_output_ns[pid] = now_ns
+            heapq.heappush(watchdog, (now_ns + grace_ns, pid))
+            cpu = mem = "n/a"
+            if psutil is not None and ch.psutil_proc is not None:
+                try:
+                    # oneshot() lets cpu_percent and memory_info share one read of the
+                    # process's stats (/proc, task_info or NtQuery*, per platform).
+                    with ch.psutil_proc.oneshot():
+                        cpu = f"{ch.psutil_proc.cpu_percent(interval=None):.1f}%"
                         mem = f"{ch.psutil_proc.memory_info().rss / (1024**2):.1f}MB"
-                    except Exception:
-                        pass
-                logger.warning(f"Child pid={ch.popen.pid} produced no output for {args.child_grace_sec}s (cpu={cpu}, rss={mem}).")
+                except Exception:
+                    pass
+            logger.warning(f"Child pid={ch.popen.pid} produced no output for {grace_ns / 1e9:g}s (cpu={cpu}, rss={mem}).")
 
-        # Check completion
-        all_done = True
-        for ch in children:
+        # Check completion: only the children whose pidfd fired, or every live one when polling.
+        if exit_watched:
+            check = [running[pid] for pid in pump.take_exited() if pid in running]
+        else:
+            check = list(running.values())
+        for ch in check:
             rc = ch.popen.poll()
             if rc is None:
-                all_done = False
                 continue
-            if rc != 0 and ch.popen.pid not in failures:
+            del running[ch.popen.pid]
+            if rc != 0:
                 failures.append(ch.popen.pid)
                 logger.error("Child pid=%s failed with rc=%s (frames=%s-%s).", ch.popen.pid, rc, ch.frame_range[0], ch.frame_range[1])
-                if args.kill_on_fail:
+                if args.kill_on_fail and not stop_children_event.is_set():
+                    # No break: the rest of `check` may already be reaped exits that must be recorded.
                     logger.error("kill_on_fail enabled -> terminating remaining children.")
                     cleanup_resources()
-                    break
 
-        if all_done:
+        if not running:
             break
 
-        if not drained:
-            time.sleep(0.15)
+    # Flush output the children wrote just before exiting, then release the pipes.
+    while True:
+        batch = pump.drain()
+        if not batch:
+            break
+        _forward_child_lines(batch)
+    pump.close()
+    _sync_child_pid_file(close=True)
 
     # Stop offloader and finalize
     # If we rendered multiple segments to support concurrent rendering of a single-file output,
@@ -1175,8 +1898,39 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
             logger.error("Leaving scratch directory intact for debugging.")
             return 2
 
-        logger.info("Stitching %d segment(s) -> %s", len(segment_outputs), local_output_path)
-        ok = ffmpeg_concat_segments(ffmpeg, segment_outputs, local_output_path, logger)
+        # Stitch under a temporary name and only put the movie in place once ffmpeg succeeds,
+        # so a failed or interrupted stitch never leaves a truncated file (or clobbers a
+        # previous good one) at the destination. The temp lives in the segment folder: with
+        # scratch that keeps the stitch (and the +faststart rewrite pass) on local disk and out
+        # of the offloader's top-level sweep, which would otherwise copy the half-written movie;
+        # without scratch the folder sits beside the destination, so os.replace is a rename.
+        stitch_path = segment_outputs[0].parent / (
+            f"{final_output_path.stem}.stmpo_{run_id}.partial{final_output_path.suffix}"
+        )
+        logger.info("Stitching %d segment(s) -> %s", len(segment_outputs), final_output_path)
+        ok = False
+        try:
+            ok = ffmpeg_concat_segments(
+                ffmpeg_path=ffmpeg,
+                segments=segment_outputs,
+                output_file=stitch_path,
+                work_dir=segment_outputs[0].parent,
+                log=logger,
+            )
+            if ok:
+                if use_scratch:
+                    _move_to_final(stitch_path, final_output_path, logger)
+                else:
+                    os.replace(stitch_path, final_output_path)
+        except Exception as ex:
+            logger.error(f"Delivering stitched output failed: {ex}")
+            ok = False
+        finally:
+            if not ok:
+                try:
+                    stitch_path.unlink()
+                except OSError:
+                    pass
         if not ok:
             logger.error("FFmpeg stitch failed. Leaving segments for debugging.")
             return 2
@@ -1185,20 +1939,23 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
         try:
             seg_dir = segment_outputs[0].parent
             shutil.rmtree(str(seg_dir), ignore_errors=True)
+            _forget_dirs(seg_dir)
         except Exception:
             pass
 
     stop_offload_event.set()
     if offloader_thread:
-        offloader_thread.join(timeout=5.0)
+        # No timeout: the final sweep's copies must land before scratch is removed below,
+        # however slow the destination share is.
+        offloader_thread.join()
 
-    # If scratch + single-file output, copy the file at end
-    if use_scratch and not output_is_seq:
+    # If scratch + single-file output, copy the file at end (stitched output was delivered above)
+    if use_scratch and not output_is_seq and not segment_outputs:
         try:
             src = local_output_path
             dst = final_output_path
             if src.exists():
-                shutil.copy2(str(src), str(dst))
+                _move_to_final(src, dst, logger)
         except Exception as ex:
             logger.warning(f"Final single-file copy failed: {ex}")
 
@@ -1206,6 +1963,7 @@ def run_orchestrator(args: argparse.Namespace, logger: logging.Logger, resolve_a
     if use_scratch:
         try:
             shutil.rmtree(str(local_scratch_dir), ignore_errors=True)
+            _forget_dirs(local_scratch_dir)
         except Exception:
             pass
 
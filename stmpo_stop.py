@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import argparse
+import mmap
 import os
 import re
 import sys
@@ -14,8 +15,10 @@ except Exception:
     psutil = None  # type: ignore
 
 
-PID_RE = re.compile(r"pid\s*=\s*(\d+)", re.IGNORECASE)
-LAUNCHED_RE = re.compile(r"Launched child\[\d+\]\s+pid=(\d+)")
+# Only the orchestrator's own "[INFO] Launched child[N] pid=123" records count. Child output
+# is logged as "[INFO] [<pid> STDOUT] ...", so a pid= quoted by a child can't match the
+# "[INFO] Launched" prefix. Bytes, so it can run directly over a memory-mapped log.
+PID_RE = re.compile(rb"\[INFO\] Launched child\[\d+\] pid=(\d+)")
 
 
 def _read_text(path: Path) -> str:
@@ -28,99 +31,121 @@ def _read_text(path: Path) -> str:
             return ""
 
 
-def _gather_pids_from_file(path: Path) -> set[int]:
+def _scan_pids(path: Path) -> set[int]:
+    """
+    Collect launched-child pids from the run log at `path`. The file is
+    memory-mapped and scanned as bytes: no decode, no str copy, and only what the regex
+    touches is paged in, so multi-GB logs stay cheap.
+    """
     pids: set[int] = set()
-    txt = _read_text(path)
-    if not txt:
-        return pids
-    for m in PID_RE.finditer(txt):
-        try:
-            pid = int(m.group(1))
-            if pid > 1:
-                pids.add(pid)
-        except Exception:
-            pass
-    # Allow plain numeric lines too (best-effort)
-    for line in txt.splitlines():
-        line = line.strip()
-        if line.isdigit():
-            try:
-                pid = int(line)
-                if pid > 1:
-                    pids.add(pid)
-            except Exception:
-                pass
+    try:
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return pids  # can't mmap an empty file
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for m in PID_RE.finditer(mm):
+                    pid = int(m.group(1))
+                    if pid > 1:
+                        pids.add(pid)
+    except Exception:
+        pass
     return pids
 
 
-def _gather_pids_from_log(path: Path) -> set[int]:
+def _gather_pids_from_file(path: Path) -> set[int]:
+    """
+    children_pids.txt holds one pid per line (legacy files used 'pid=N'), so a plain int()
+    per line is enough; no regex needed.
+    """
     pids: set[int] = set()
-    txt = _read_text(path)
-    if not txt:
-        return pids
-    for m in LAUNCHED_RE.finditer(txt):
-        try:
-            pid = int(m.group(1))
-            if pid > 1:
-                pids.add(pid)
-        except Exception:
-            pass
-    # Also capture any explicit pid= lines written elsewhere
-    for m in PID_RE.finditer(txt):
-        try:
-            pid = int(m.group(1))
-            if pid > 1:
-                pids.add(pid)
-        except Exception:
-            pass
+    try:
+        with path.open("r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                tok = line.rpartition("=")[2].strip()
+                if tok.isdigit():
+                    pid = int(tok)
+                    if pid > 1:
+                        pids.add(pid)
+    except Exception:
+        pass
     return pids
 
 
-def _kill_tree(pid: int, grace: float = 2.0) -> None:
-    if pid <= 1:
+def _gather_pids_from_log(path: Path) -> set[int]:
+    # The orchestrator's "Launched child[N] pid=..." records only
+    return _scan_pids(path)
+
+
+def _kill_trees(pids: list[int], grace: float = 2.0) -> None:
+    """
+    Terminate every pid in `pids` plus their descendants as one group: a single terminate
+    broadcast, one shared wait, then kill whatever is left. Wall time is ~grace regardless
+    of how many processes are involved.
+    """
+    pids = [pid for pid in pids if pid > 1]
+    if not pids:
         return
 
     if psutil is None:
         # Fallback: basic kill
         try:
             if os.name == "nt":
-                os.system(f'taskkill /PID {pid} /T /F >NUL 2>NUL')
+                args = " ".join(f"/PID {pid}" for pid in pids)
+                os.system(f"taskkill {args} /T /F >NUL 2>NUL")
             else:
-                os.kill(pid, 15)
+                for pid in pids:
+                    try:
+                        os.kill(pid, 15)
+                    except Exception:
+                        pass
                 time.sleep(min(grace, 0.5))
-                os.kill(pid, 9)
+                for pid in pids:
+                    try:
+                        os.kill(pid, 9)
+                    except Exception:
+                        pass
         except Exception:
             pass
         return
 
-    try:
-        p = psutil.Process(pid)
-    except Exception:
+    procs: dict[int, object] = {}
+    for pid in pids:
+        try:
+            p = psutil.Process(pid)
+        except Exception:
+            continue
+        procs.setdefault(p.pid, p)
+        try:
+            for c in p.children(recursive=True):
+                procs.setdefault(c.pid, c)
+        except Exception:
+            pass
+    if not procs:
         return
-
-    procs = []
-    try:
-        procs = [p] + p.children(recursive=True)
-    except Exception:
-        procs = [p]
+    group = list(procs.values())
 
     # terminate
-    for proc in procs:
+    for proc in group:
         try:
             proc.terminate()
         except Exception:
             pass
 
     try:
-        gone, alive = psutil.wait_procs(procs, timeout=grace)
+        gone, alive = psutil.wait_procs(group, timeout=grace)
     except Exception:
-        alive = procs
+        alive = group
 
     for proc in alive:
         try:
             proc.kill()
         except Exception:
             pass
+    if alive:
+        try:
+            psutil.wait_procs(alive, timeout=1.0)
+        except Exception:
+            pass
 
 
 def main(argv: list[str]) -> int:
@@ -151,13 +176,12 @@ def main(argv: list[str]) -> int:
     pids: set[int] = set()
 
     # runner pid
+    runner_pid = None
     if pid_file.exists():
         txt = _read_text(pid_file).strip()
         if txt.isdigit():
-            try:
-                pids.add(int(txt))
-            except Exception:
-                pass
+            runner_pid = int(txt)
+            pids.add(runner_pid)
 
     if child_pid_file is None:
         child_pid_file = pid_file.with_name("children_pids.txt")
@@ -165,7 +189,8 @@ def main(argv: list[str]) -> int:
     if child_pid_file and child_pid_file.exists():
         pids |= _gather_pids_from_file(child_pid_file)
 
-    if log_file and log_file.exists():
+    # The log scan is only a fallback for runs that didn't write children_pids.txt.
+    if log_file and log_file.exists() and not (pids - {runner_pid}):
         pids |= _gather_pids_from_log(log_file)
 
     # Kill children first, then runner (prevents respawn)
@@ -175,19 +200,10 @@ def main(argv: list[str]) -> int:
     log("Stop requested. Target PIDs: %s" % (", ".join([str(p) for p in pids_list]) if pids_list else "(none)"))
 
     # Try to kill non-runner first
-    runner_pid = None
-    if pid_file.exists():
-        txt = _read_text(pid_file).strip()
-        if txt.isdigit():
-            runner_pid = int(txt)
-
-    for pid in pids_list:
-        if runner_pid is not None and pid == runner_pid:
-            continue
-        _kill_tree(pid, grace=2.0)
+    _kill_trees([pid for pid in pids_list if pid != runner_pid], grace=2.0)
 
     if runner_pid is not None:
-        _kill_tree(runner_pid, grace=2.0)
+        _kill_trees([runner_pid], grace=2.0)
 
     # Best-effort cleanup
     try:
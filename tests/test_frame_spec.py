@@ -0,0 +1,184 @@
+import copy
+import pickle
+import random
+import unittest
+from typing import List, Optional, Tuple
+
+from stmpo.frame_spec import (
+    Chunk,
+    build_chunks,
+    build_chunks_from_ranges,
+    parse_frames,
+    parse_frames_ranges,
+    select_task_range,
+)
+
+
+# Reference copies of the original frame-by-frame implementations; the range-based
+# rewrite has to agree with them on every spec they accept.
+def _reference_parse_frames(frames_spec: str) -> List[int]:
+    frames: List[int] = []
+    for part in str(frames_spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            a, b = part.split("-", 1)
+            start, end = int(a), int(b)
+            if end < start:
+                start, end = end, start
+            frames.extend(range(start, end + 1))
+        else:
+            frames.append(int(part))
+    return sorted(set(frames))
+
+
+def _reference_build_chunks(frames: List[int], chunk_size: int) -> List[Chunk]:
+    chunks: List[Chunk] = []
+    if not frames:
+        return chunks
+    if chunk_size <= 0:
+        chunk_size = len(frames)
+    chunk_start = prev = frames[0]
+    count = 1
+    for f in frames[1:]:
+        if f != prev + 1 or count >= chunk_size:
+            chunks.append(Chunk(len(chunks), chunk_start, prev))
+            chunk_start = f
+            count = 1
+        else:
+            count += 1
+        prev = f
+    chunks.append(Chunk(len(chunks), chunk_start, prev))
+    return chunks
+
+
+def _reference_select(frames_spec: str, chunk_size: Optional[int], index: Optional[int]) -> Tuple[int, int]:
+    frames = _reference_parse_frames(frames_spec)
+    if not frames:
+        raise ValueError(frames_spec)
+    if chunk_size and index is not None:
+        match = next((c for c in _reference_build_chunks(frames, int(chunk_size)) if c.index == int(index)), None)
+        if not match:
+            raise ValueError(index)
+        return match.start_frame, match.end_frame
+    return frames[0], frames[-1]
+
+
+def _random_spec(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 5)):
+        kind = rng.random()
+        a, b = rng.randint(0, 60), rng.randint(0, 60)
+        if kind < 0.15:
+            parts.append("")
+        elif kind < 0.45:
+            parts.append(f"{' ' * rng.randint(0, 2)}{a}{' ' * rng.randint(0, 2)}")
+        else:
+            parts.append(f"{' ' * rng.randint(0, 2)}{a}{' ' * rng.randint(0, 1)}-{' ' * rng.randint(0, 1)}{b} ")
+    return ",".join(parts)
+
+
+class ParseFramesRangesTests(unittest.TestCase):
+    def test_single_and_multiple_ranges(self) -> None:
+        self.assertEqual(parse_frames_ranges("0-99"), [(0, 99)])
+        self.assertEqual(parse_frames_ranges("0-99,120-200"), [(0, 99), (120, 200)])
+        self.assertEqual(parse_frames_ranges("7"), [(7, 7)])
+
+    def test_reversed_range_is_swapped(self) -> None:
+        self.assertEqual(parse_frames_ranges("10-5"), [(5, 10)])
+
+    def test_overlapping_and_adjacent_parts_merge(self) -> None:
+        self.assertEqual(parse_frames_ranges("5-10,8-12"), [(5, 12)])
+        self.assertEqual(parse_frames_ranges("1-3,4-6"), [(1, 6)])
+        self.assertEqual(parse_frames_ranges("20-30,1-2,25"), [(1, 2), (20, 30)])
+
+    def test_whitespace_and_empty_parts(self) -> None:
+        self.assertEqual(parse_frames_ranges(" 1 - 5 ,, 8 ,"), [(1, 5), (8, 8)])
+        self.assertEqual(parse_frames_ranges(""), [])
+        self.assertEqual(parse_frames_ranges(" , ,"), [])
+
+    def test_invalid_specs_raise(self) -> None:
+        # No step syntax: like the original int() parse, anything else is rejected.
+        for spec in ("1-10x2", "a-b", "-5", "1-", "1--3", "1.5"):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    parse_frames_ranges(spec)
+
+    def test_parse_frames_expands_ranges(self) -> None:
+        self.assertEqual(parse_frames("3-1,5"), [1, 2, 3, 5])
+
+
+class ChunkingTests(unittest.TestCase):
+    def test_chunks_step_through_each_run(self) -> None:
+        self.assertEqual(
+            build_chunks_from_ranges([(0, 9), (20, 22)], 4),
+            [Chunk(0, 0, 3), Chunk(1, 4, 7), Chunk(2, 8, 9), Chunk(3, 20, 22)],
+        )
+
+    def test_non_positive_chunk_size_means_one_chunk_per_run(self) -> None:
+        self.assertEqual(build_chunks_from_ranges([(0, 9), (20, 22)], 0), [Chunk(0, 0, 9), Chunk(1, 20, 22)])
+
+    def test_build_chunks_from_frames(self) -> None:
+        self.assertEqual(build_chunks([], 3), [])
+        self.assertEqual(build_chunks([1, 2, 3, 7], 2), [Chunk(0, 1, 2), Chunk(1, 3, 3), Chunk(2, 7, 7)])
+
+    def test_select_task_range(self) -> None:
+        self.assertEqual(select_task_range("0-99", 10, 3), (30, 39))
+        self.assertEqual(select_task_range("0-9,20-22", 4, 3), (20, 22))
+        self.assertEqual(select_task_range("5-1", None, None), (1, 5))
+        with self.assertRaises(ValueError):
+            select_task_range("0-9", 5, 2)
+        with self.assertRaises(ValueError):
+            select_task_range("0-9", 5, -1)
+        with self.assertRaises(ValueError):
+            select_task_range(" , ", 5, 0)
+
+
+class ReferenceEquivalenceTests(unittest.TestCase):
+    def test_matches_original_implementation(self) -> None:
+        rng = random.Random(1234)
+        for _ in range(2000):
+            spec = _random_spec(rng)
+            frames = _reference_parse_frames(spec)
+            with self.subTest(spec=spec):
+                self.assertEqual(parse_frames(spec), frames)
+                for size in (0, 1, 3, 7):
+                    self.assertEqual(build_chunks(frames, size), _reference_build_chunks(frames, size))
+                    self.assertEqual(
+                        build_chunks_from_ranges(parse_frames_ranges(spec), size),
+                        _reference_build_chunks(frames, size),
+                    )
+                if not frames:
+                    continue
+                for size, index in ((None, None), (3, 0), (3, 2), (7, 5), (1, 40)):
+                    try:
+                        expected = _reference_select(spec, size, index)
+                    except ValueError:
+                        with self.assertRaises(ValueError):
+                            select_task_range(spec, size, index)
+                    else:
+                        self.assertEqual(select_task_range(spec, size, index), expected)
+
+
+class ChunkCopyTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.chunk = Chunk(index=2, start_frame=10, end_frame=19)
+
+    def test_pickle_round_trip(self) -> None:
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            restored = pickle.loads(pickle.dumps(self.chunk, protocol=protocol))
+            self.assertEqual(restored, self.chunk)
+
+    def test_copy_and_deepcopy(self) -> None:
+        self.assertEqual(copy.copy(self.chunk), self.chunk)
+        self.assertEqual(copy.deepcopy(self.chunk), self.chunk)
+
+    def test_still_frozen(self) -> None:
+        restored = pickle.loads(pickle.dumps(self.chunk))
+        with self.assertRaises(AttributeError):
+            restored.index = 5  # type: ignore[misc]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from stmpo.orchestrator import _take_lines, build_affinity_blocks
+
+
+class TakeLinesTests(unittest.TestCase):
+    def test_splits_on_lf_cr_and_crlf(self) -> None:
+        buf = bytearray(b"a\nPROGRESS: 1\rPROGRESS: 2\r\nb\n")
+        self.assertEqual(_take_lines(buf), [b"a", b"PROGRESS: 1", b"PROGRESS: 2", b"b"])
+        self.assertEqual(buf, b"")
+
+    def test_keeps_unterminated_tail(self) -> None:
+        buf = bytearray(b"one\ntw")
+        self.assertEqual(_take_lines(buf), [b"one"])
+        self.assertEqual(buf, b"tw")
+        self.assertEqual(_take_lines(bytearray(b"no break")), [])
+
+    def test_trailing_cr_waits_for_possible_lf(self) -> None:
+        buf = bytearray(b"x\ny\r")
+        self.assertEqual(_take_lines(buf), [b"x"])
+        self.assertEqual(buf, b"y\r")
+        buf += b"\nz\n"
+        self.assertEqual(_take_lines(buf), [b"y", b"z"])
+        self.assertEqual(buf, b"")
+
+    def test_lone_cr_only_buffer_is_held(self) -> None:
+        buf = bytearray(b"\r")
+        self.assertEqual(_take_lines(buf), [])
+        self.assertEqual(buf, b"\r")
+
+    def test_empty_lines_are_kept(self) -> None:
+        self.assertEqual(_take_lines(bytearray(b"a\n\nb\n")), [b"a", b"", b"b"])
+
+    def test_split_reads_match_one_read(self) -> None:
+        data = b"aaa\rPROGRESS: 1\rPROGRESS: 2\r\nline\n\nx\r\ny\n"
+        whole = _take_lines(bytearray(data))
+        for step in (1, 2, 3, 5):
+            with self.subTest(step=step):
+                buf = bytearray()
+                got = []
+                for i in range(0, len(data), step):
+                    buf += data[i:i + step]
+                    got.extend(_take_lines(buf))
+                self.assertEqual(got, whole)
+                self.assertEqual(buf, b"")
+
+
+class BuildAffinityBlocksTests(unittest.TestCase):
+    def test_round_robin_across_nodes(self) -> None:
+        self.assertEqual(
+            build_affinity_blocks(4, [[0, 1, 2, 3], [4, 5, 6, 7]]),
+            [[0, 1], [4, 5], [2, 3], [6, 7]],
+        )
+
+    def test_uneven_children_per_node(self) -> None:
+        # Node 0 hosts children 0 and 2, node 1 only child 1.
+        self.assertEqual(
+            build_affinity_blocks(3, [[0, 1, 2, 3], [4, 5, 6, 7]]),
+            [[0, 1], [4, 5, 6, 7], [2, 3]],
+        )
+
+    def test_fewer_children_than_nodes_get_whole_nodes(self) -> None:
+        self.assertEqual(build_affinity_blocks(1, [[0, 1], [2, 3]]), [[0, 1, 2, 3]])
+        self.assertEqual(build_affinity_blocks(2, [[0], [1], [2]]), [[0, 2], [1]])
+
+    def test_more_children_than_cpus_share(self) -> None:
+        self.assertEqual(build_affinity_blocks(3, [[0, 1]]), [[0], [1], [0]])
+
+    def test_duplicate_cpus_are_dropped(self) -> None:
+        self.assertEqual(build_affinity_blocks(2, [[0, 1, 1], [1, 2]]), [[0, 1], [2]])
+
+    def test_no_cpus_or_children(self) -> None:
+        self.assertEqual(build_affinity_blocks(2, []), [])
+        self.assertEqual(build_affinity_blocks(2, [[], []]), [])
+        self.assertEqual(build_affinity_blocks(0, [[0, 1]]), [])
+
+    def test_returns_one_block_per_child(self) -> None:
+        pools = [[0, 1, 2, 3, 4, 5], [6, 7, 8, 9, 10, 11]]
+        for concurrency in range(1, 16):
+            with self.subTest(concurrency=concurrency):
+                blocks = build_affinity_blocks(concurrency, pools)
+                self.assertEqual(len(blocks), concurrency)
+                self.assertTrue(all(blocks))
+                # No child straddles nodes once there are at least as many children as nodes.
+                if concurrency >= len(pools):
+                    for block in blocks:
+                        self.assertTrue(set(block) <= set(pools[0]) or set(block) <= set(pools[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from stmpo_stop import PID_RE, _gather_pids_from_file, _gather_pids_from_log
+
+
+class _TmpFileCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.dir = Path(self._tmp.name)
+
+    def write(self, name: str, data: bytes) -> Path:
+        p = self.dir / name
+        p.write_bytes(data)
+        return p
+
+
+class PidRegexTests(unittest.TestCase):
+    def test_matches_launch_lines_only(self) -> None:
+        log = (
+            b"2026-01-01 00:00:00 [INFO] Runner pid=111\n"
+            b"2026-01-01 00:00:00 [INFO] Launched child[0] pid=222 frames=1-7\n"
+            b"2026-01-01 00:00:00 [INFO] [222 STDOUT] pid=333 Launched child[9] pid=444\n"
+            b"2026-01-01 00:00:00 [WARNING] Child pid=555 produced no output for 10s\n"
+            b"2026-01-01 00:00:01 [INFO] Launched child[12] pid=666 frames=8-14\n"
+        )
+        self.assertEqual([int(m.group(1)) for m in PID_RE.finditer(log)], [222, 666])
+
+
+class GatherPidsFromLogTests(_TmpFileCase):
+    def test_scans_log(self) -> None:
+        p = self.write(
+            "last_run.log",
+            b"x [INFO] Launched child[0] pid=1234 frames=0-9\n"
+            b"x [INFO] Launched child[1] pid=1 frames=10-19\n"
+            b"x [INFO] Launched child[2] pid=1234 frames=20-29\n",
+        )
+        self.assertEqual(_gather_pids_from_log(p), {1234})
+
+    def test_empty_and_missing_log(self) -> None:
+        self.assertEqual(_gather_pids_from_log(self.write("empty.log", b"")), set())
+        self.assertEqual(_gather_pids_from_log(self.dir / "missing.log"), set())
+
+
+class GatherPidsFromFileTests(_TmpFileCase):
+    def test_plain_and_legacy_lines(self) -> None:
+        p = self.write("children_pids.txt", b"1234\n5678\r\npid=42\n  77  \n1234\n")
+        self.assertEqual(_gather_pids_from_file(p), {1234, 5678, 42, 77})
+
+    def test_skips_junk_and_low_pids(self) -> None:
+        p = self.write("children_pids.txt", b"\n0\n1\nabc\n-5\n12x\n99")
+        self.assertEqual(_gather_pids_from_file(p), {99})
+
+    def test_missing_file(self) -> None:
+        self.assertEqual(_gather_pids_from_file(self.dir / "missing.txt"), set())
+
+
+if __name__ == "__main__":
+    unittest.main()